@@ -0,0 +1,54 @@
+import gc
+import timeit
+
+try:
+    import tracemalloc
+except ImportError:  # Python 2
+    tracemalloc = None
+
+SHAPES = ['flat', 'grouped']
+
+# The number of choices in each optgroup of grouped choices.
+GROUP_SIZE = 10
+
+
+def make_choices(size, shape='flat'):
+    choices = [('choice-{0}'.format(i), 'Choice {0}'.format(i)) for i in range(size)]
+    if shape == 'grouped':
+        return [
+            ('Group {0}'.format(i // GROUP_SIZE), choices[i:i + GROUP_SIZE])
+            for i in range(0, size, GROUP_SIZE)
+        ]
+    return choices
+
+
+def scaled(number, size):
+    """
+    Return the number of calls to make to a function whose cost grows with the
+    number of choices, so that the largest sizes still finish in time.
+    """
+    return max(1, number * 10 // size)
+
+
+def measure(func, number):
+    """
+    Call ``func`` ``number`` times after a warm-up call and return the mean time per call in
+    seconds and the peak memory allocated while doing so in bytes, or
+    ``None`` if memory tracing isn't available.
+    """
+    func()
+    gc.collect()
+    start = timeit.default_timer()
+    for _ in range(number):
+        func()
+    elapsed = (timeit.default_timer() - start) / number
+
+    peak = None
+    if tracemalloc is not None:
+        gc.collect()
+        tracemalloc.start()
+        for _ in range(number):
+            func()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return elapsed, peak
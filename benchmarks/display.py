@@ -0,0 +1,36 @@
+from django.utils.encoding import force_text
+
+from lazychoices.models import resolve_displays
+from lazychoices.utils import flatten_choices
+
+from .base import make_choices, measure, scaled
+from .models import Item
+
+INSTANCES = 1000
+
+
+def uncached_display(instance, field):
+    # The lookup as it was done before the labels were cached per class.
+    choices = getattr(instance, field.choices_name, [])
+    value = getattr(instance, field.attname)
+    return force_text(dict(flatten_choices(choices)).get(value, value), strings_only=True)
+
+
+def run(sizes, shapes, number):
+    field = Item._meta.get_field('category')
+    for shape in shapes:
+        for size in sizes:
+            Item.CATEGORY_CHOICES = make_choices(size, shape)
+            instance = Item(category='choice-{0}'.format(size - 1))
+            yield ('display', size, shape, 'uncached') + measure(
+                lambda: uncached_display(instance, field), scaled(number, size),
+            )
+            yield ('display', size, shape, 'cached') + measure(instance.get_category_display, number)
+
+            instances = [Item(category='choice-{0}'.format(i % size)) for i in range(INSTANCES)]
+            yield ('display', size, shape, 'x{0}'.format(INSTANCES)) + measure(
+                lambda: [instance.get_category_display() for instance in instances], 1,
+            )
+            yield ('display', size, shape, 'bulk x{0}'.format(INSTANCES)) + measure(
+                lambda: list(resolve_displays(instances, 'category')), 1,
+            )
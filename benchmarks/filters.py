@@ -0,0 +1,47 @@
+from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
+from django.test import RequestFactory
+
+from lazychoices.admin import LazyChoicesFieldListFilter
+
+from .base import make_choices, measure, scaled
+from .models import Item
+
+ROWS = 1000
+
+
+class CountingLazyChoicesFieldListFilter(LazyChoicesFieldListFilter):
+    show_counts = True
+
+
+class ItemAdmin(admin.ModelAdmin):
+    list_filter = [('category', LazyChoicesFieldListFilter)]
+
+
+class ItemCountAdmin(admin.ModelAdmin):
+    list_filter = [('category', CountingLazyChoicesFieldListFilter)]
+
+
+def render_filter(request, model_admin):
+    changelist = ChangeList(
+        request, Item, model_admin.list_display,
+        model_admin.list_display_links, model_admin.list_filter,
+        model_admin.date_hierarchy, model_admin.search_fields,
+        model_admin.list_select_related, model_admin.list_per_page,
+        model_admin.list_max_show_all, model_admin.list_editable, model_admin,
+    )
+    spec = changelist.get_filters(request)[0][0]
+    return list(spec.choices(changelist))
+
+
+def run(sizes, shapes, number):
+    request = RequestFactory().get('/', {'category__exact': 'choice-0'})
+    for variant, model_admin in [('plain', ItemAdmin(Item, admin.site)), ('counts', ItemCountAdmin(Item, admin.site))]:
+        for shape in shapes:
+            for size in sizes:
+                Item.CATEGORY_CHOICES = make_choices(size, shape)
+                Item.objects.all().delete()
+                Item.objects.bulk_create(Item(category='choice-{0}'.format(i % size)) for i in range(ROWS))
+                yield ('filter', size, shape, variant) + measure(
+                    lambda: render_filter(request, model_admin), scaled(number, size),
+                )
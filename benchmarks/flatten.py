@@ -0,0 +1,12 @@
+from lazychoices.utils import flatten_choices
+
+from .base import make_choices, measure, scaled
+
+
+def run(sizes, shapes, number):
+    for shape in shapes:
+        for size in sizes:
+            choices = make_choices(size, shape)
+            yield ('flatten', size, shape, 'list') + measure(
+                lambda: list(flatten_choices(choices)), scaled(number, size),
+            )
@@ -0,0 +1,43 @@
+from django.forms import Select
+
+from lazychoices.forms import LazyChoiceModelForm
+
+from .base import make_choices, measure, scaled
+from .models import Item
+
+FORMS = 1000
+
+
+class ItemForm(LazyChoiceModelForm):
+    class Meta:
+        fields = '__all__'
+        model = Item
+
+
+def run(sizes, shapes, number):
+    field = Item._meta.get_field('category')
+    for shape in shapes:
+        for size in sizes:
+            Item.CATEGORY_CHOICES = make_choices(size, shape)
+            yield ('formfield', size, shape, 'construct') + measure(field.formfield, number)
+    for result in run_render(sizes, shapes, number):
+        yield result
+    for shape in shapes:
+        for size in sizes:
+            Item.CATEGORY_CHOICES = make_choices(size, shape)
+            yield ('form', size, shape, 'x{0}'.format(FORMS)) + measure(lambda: [ItemForm() for _ in range(FORMS)], 1)
+
+
+def run_render(sizes, shapes, number):
+    for shape in shapes:
+        for size in sizes:
+            Item.CATEGORY_CHOICES = make_choices(size, shape)
+            widget = ItemForm().fields['category'].widget
+            select = Select(choices=widget.choices)
+            value = 'choice-{0}'.format(size // 2)
+            yield ('render', size, shape, 'select') + measure(
+                lambda: select.render('category', value), scaled(number, size),
+            )
+            yield ('render', size, shape, 'cached') + measure(
+                lambda: widget.render('category', value), scaled(number, size),
+            )
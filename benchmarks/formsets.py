@@ -0,0 +1,45 @@
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.test import RequestFactory
+
+from lazychoices.admin import LazyChoiceInlineModelAdminMixin
+from lazychoices.forms import LazyChoiceModelForm
+
+from .base import make_choices, measure
+from .models import Entry, Item
+
+FORMS = 500
+
+
+class EntryInline(LazyChoiceInlineModelAdminMixin, admin.TabularInline):
+    extra = 0
+    form = LazyChoiceModelForm
+    lazy_model = Item
+    max_num = FORMS
+    model = Entry
+
+
+def validate_formset(inline, request, item, data):
+    FormSet = inline.get_formset(request, item)
+    formset = FormSet(data, instance=item)
+    assert formset.is_valid()
+
+
+def run(sizes, shapes, number):
+    inline = EntryInline(Item, admin.site)
+    request = RequestFactory().get('/')
+    request.user = User(is_active=True, is_superuser=True)
+    item = Item()
+
+    for shape in shapes:
+        for size in sizes:
+            Item.CATEGORY_CHOICES = make_choices(size, shape)
+            data = {
+                'entry_set-TOTAL_FORMS': str(FORMS),
+                'entry_set-INITIAL_FORMS': '0',
+                'entry_set-MAX_NUM_FORMS': str(FORMS),
+            }
+            for i in range(FORMS):
+                data['entry_set-{0}-category'.format(i)] = 'choice-{0}'.format(i % size)
+            result = measure(lambda: validate_formset(inline, request, item, data), 1)
+            yield ('formset', size, shape, 'x{0}'.format(FORMS)) + result
@@ -0,0 +1,14 @@
+from django.db import models
+
+from lazychoices import LazyChoiceField, LazyChoiceModelMixin
+
+
+class Item(LazyChoiceModelMixin, models.Model):
+    CATEGORY_CHOICES = []
+
+    category = LazyChoiceField(max_length=50)
+
+
+class Entry(LazyChoiceModelMixin, models.Model):
+    item = models.ForeignKey(Item, on_delete=models.CASCADE)
+    category = LazyChoiceField(max_length=50)
@@ -0,0 +1,20 @@
+from .base import make_choices, measure
+from .models import Item
+
+INSTANCES = 1000
+
+
+def run(sizes, shapes, number):
+    field = Item._meta.get_field('category')
+    for shape in shapes:
+        for size in sizes:
+            Item.CATEGORY_CHOICES = make_choices(size, shape)
+            instance = Item(category='choice-{0}'.format(size - 1))
+            yield ('validate', size, shape, 'single') + measure(
+                lambda: field.validate(instance.category, instance), number,
+            )
+
+            instances = [Item(category='choice-{0}'.format(i % size)) for i in range(INSTANCES)]
+            yield ('validate', size, shape, 'x{0}'.format(INSTANCES)) + measure(
+                lambda: list(field.validate_many(instances)), 1,
+            )
@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+import argparse
+import json
+import platform
+import sys
+from importlib import import_module
+
+import django
+from django.conf import settings
+from django.db import connection
+from django.test.utils import setup_test_environment
+
+from runtests import DEFAULT_SETTINGS
+
+BENCHMARKS = [
+    'validate',
+    'display',
+    'flatten',
+    'forms',
+    'formsets',
+    'filters',
+]
+
+SIZES = [10, 100, 1000, 10000, 100000]
+
+SHAPES = ['flat', 'grouped']
+
+
+def format_result(name, size, shape, variant, elapsed, peak):
+    return '{0:<10} {1:>7} {2:<8} {3:<10} {4:>14.2f}us {5:>12}'.format(
+        name, size, shape, variant, elapsed * 1e6, 'n/a' if peak is None else '{0}B'.format(peak),
+    )
+
+
+def format_json(results):
+    import lazychoices
+
+    return json.dumps({
+        'lazychoices': lazychoices.__version__,
+        'django': django.get_version(),
+        'python': platform.python_version(),
+        'results': [
+            {
+                'benchmark': name,
+                'size': size,
+                'shape': shape,
+                'variant': variant,
+                'seconds': elapsed,
+                'peak_bytes': peak,
+            }
+            for name, size, shape, variant, elapsed, peak in results
+        ],
+    }, indent=2, sort_keys=True)
+
+
+def runbenchmarks(benchmarks=None, sizes=None, shapes=None, number=1000, output=None):
+    if not settings.configured:
+        settings.configure(**dict(
+            DEFAULT_SETTINGS,
+            INSTALLED_APPS=DEFAULT_SETTINGS['INSTALLED_APPS'] + ['benchmarks'],
+        ))
+
+    django.setup()
+    setup_test_environment()
+    connection.creation.create_test_db(verbosity=0)
+
+    results = []
+    for name in benchmarks or BENCHMARKS:
+        module = import_module('benchmarks.{0}'.format(name))
+        for result in module.run(sizes or SIZES, shapes or SHAPES, number):
+            results.append(result)
+            sys.stdout.write(format_result(*result) + '\n')
+
+    if output is not None:
+        with open(output, 'w') as f:
+            f.write(format_json(results) + '\n')
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Run the lazychoices benchmarks against SQLite.')
+    parser.add_argument(
+        'benchmarks', nargs='*', metavar='benchmark',
+        help='The benchmarks to run, out of: {0}. Defaults to all of them.'.format(', '.join(BENCHMARKS)),
+    )
+    parser.add_argument('--size', type=int, action='append', dest='sizes', help='A number of choices to run with.')
+    parser.add_argument('--shape', choices=SHAPES, action='append', dest='shapes', help='Flat or grouped choices.')
+    parser.add_argument('--number', type=int, default=1000, help='The number of calls to time per benchmark.')
+    parser.add_argument('--json', dest='output', help='Write the results as JSON to this file.')
+    options = parser.parse_args()
+
+    unknown = set(options.benchmarks) - set(BENCHMARKS)
+    if unknown:
+        parser.error('unknown benchmarks: {0}'.format(', '.join(sorted(unknown))))
+
+    runbenchmarks(options.benchmarks, options.sizes, options.shapes, options.number, options.output)
@@ -1,3 +1,4 @@
-from .models import LazyChoiceField, LazyChoiceModelMixin  # noqa
+from .choices import ChoiceProvider, invalidate  # noqa
+from .models import CodedLazyChoiceField, LazyChoiceField, LazyChoiceModelMixin  # noqa
 
 __version__ = '0.2.0'
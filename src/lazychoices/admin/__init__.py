@@ -1,2 +1,5 @@
-from .filters import LazyChoicesFieldListFilter  # noqa
-from .mixins import LazyChoiceInlineModelAdminMixin  # noqa
+from .actions import export_as_csv, export_as_json_lines  # noqa
+from .filters import LazyChoicesFieldListFilter, LazyChoicesOnlyFieldListFilter  # noqa
+from .mixins import (  # noqa
+    LazyChoiceAutocompleteMixin, LazyChoiceChangeList, LazyChoiceInlineModelAdminMixin, LazyChoiceModelAdminMixin,
+)
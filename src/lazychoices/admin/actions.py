@@ -0,0 +1,95 @@
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from django.utils import six
+from django.utils.encoding import force_bytes
+from django.utils.translation import ugettext_lazy as _
+
+from lazychoices.models import LazyChoiceField, LazyChoiceQuerySet
+
+
+class _Echo(object):
+    # A file-like object that returns what's written to it, so that the CSV
+    # writer produces rows to stream instead of buffering them.
+    def write(self, value):
+        return value
+
+
+def _get_columns(modeladmin, request):
+    opts = modeladmin.model._meta
+    if hasattr(modeladmin, 'get_lazy_export_fields'):
+        fields = list(modeladmin.get_lazy_export_fields(request))
+    else:
+        fields = [field.attname for field in opts.concrete_fields]
+
+    columns = []
+    for name in fields:
+        columns.append(name)
+        if any(isinstance(field, LazyChoiceField) and field.attname == name for field in opts.fields):
+            columns.append('{0}_display'.format(name))
+    return fields, columns
+
+
+def _get_rows(modeladmin, request, queryset, fields):
+    if not isinstance(queryset, LazyChoiceQuerySet):
+        queryset = LazyChoiceQuerySet(model=queryset.model, query=queryset.query.clone(), using=queryset.db)
+    chunk_size = getattr(modeladmin, 'lazy_export_chunk_size', 2000)
+    return queryset.values_with_display(*fields, chunk_size=chunk_size)
+
+
+def _stream(content, content_type, modeladmin, extension):
+    response = StreamingHttpResponse(content, content_type=content_type)
+    response['Content-Disposition'] = 'attachment; filename="{0}.{1}"'.format(
+        modeladmin.model._meta.model_name, extension,
+    )
+    return response
+
+
+def export_as_csv(modeladmin, request, queryset):
+    """
+    Stream the selected objects as CSV, with a ``<field>_display`` column of
+    labels after each lazy choice field.
+
+    The exported fields are those returned by ``get_lazy_export_fields()``
+    of a ``LazyChoiceModelAdminMixin``, or all the concrete fields. The rows
+    are read in chunks, without instantiating any models, so the memory used
+    doesn't depend on the number of rows.
+    """
+    fields, columns = _get_columns(modeladmin, request)
+
+    def encode(value):
+        if value is None:
+            return ''
+        # The csv module of Python 2 only writes bytes.
+        return force_bytes(value) if six.PY2 else value
+
+    def generate():
+        writer = csv.writer(_Echo())
+        yield writer.writerow([encode(column) for column in columns])
+        for row in _get_rows(modeladmin, request, queryset, fields):
+            yield writer.writerow([encode(row[column]) for column in columns])
+
+    return _stream(generate(), 'text/csv; charset=utf-8', modeladmin, 'csv')
+
+
+export_as_csv.short_description = _('Export selected %(verbose_name_plural)s as CSV')
+
+
+def export_as_json_lines(modeladmin, request, queryset):
+    """
+    Stream the selected objects as JSON lines, one object per line, with a
+    ``<field>_display`` label for each lazy choice field. See
+    ``export_as_csv()``.
+    """
+    fields = _get_columns(modeladmin, request)[0]
+
+    def generate():
+        for row in _get_rows(modeladmin, request, queryset, fields):
+            yield json.dumps(row, cls=DjangoJSONEncoder, sort_keys=True) + '\n'
+
+    return _stream(generate(), 'application/x-ndjson; charset=utf-8', modeladmin, 'jsonl')
+
+
+export_as_json_lines.short_description = _('Export selected %(verbose_name_plural)s as JSON lines')
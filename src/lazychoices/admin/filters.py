@@ -1,14 +1,31 @@
+import hashlib
+
 from django.contrib.admin import ChoicesFieldListFilter
-from django.utils.encoding import smart_text
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+from django.db.models import Count
+from django.db.models.sql.datastructures import EmptyResultSet
+from django.utils.encoding import force_bytes, force_text, smart_text
+from django.utils.http import urlencode
 from django.utils.translation import ugettext_lazy as _
 
+from lazychoices import stats
+from lazychoices.choices import get_choice_index
 from lazychoices.compat import get_empty_value_display
-from lazychoices.utils import flatten_choices
 
 
 class LazyChoicesFieldListFilter(ChoicesFieldListFilter):
+    # Set to True to show how many rows of the changelist match each choice,
+    # counted with a single aggregate query.
+    show_counts = False
+    # The number of seconds to cache the counts for, or None to not cache them.
+    counts_cache_timeout = None
+    counts_cache_alias = DEFAULT_CACHE_ALIAS
+
     def __init__(self, field, request, params, model, model_admin, field_path):
-        self.lookup_choices = flatten_choices(self.field_choices(field, request, model_admin))
+        self.choice_index = get_choice_index(model_admin.model, field.choices_name)
+        # field_choices() runs before the base class sets this.
+        self.field_path = field_path
+        self.lookup_choices = self.field_choices(field, request, model_admin)
         self.lookup_kwarg_isnull = '{0}__isnull'.format(field_path)
         self.lookup_val_isnull = request.GET.get(self.lookup_kwarg_isnull)
         super(LazyChoicesFieldListFilter, self).__init__(field, request, params, model, model_admin, field_path)
@@ -18,21 +35,75 @@ class LazyChoicesFieldListFilter(ChoicesFieldListFilter):
         return [self.lookup_kwarg, self.lookup_kwarg_isnull]
 
     def field_choices(self, field, request, model_admin):
-        return getattr(model_admin.model, field.choices_name, [])
+        return self.choice_index.flat
+
+    def get_lookup_fragments(self):
+        """
+        Return a dict mapping each choice to its text value and its encoded
+        query string parameter, which don't depend on the request and are
+        cached for as long as the choices don't change.
+        """
+        def build():
+            fragments = {}
+            for lookup in self.choice_index.keys:
+                fragments[lookup] = (smart_text(lookup), urlencode([(self.lookup_kwarg, lookup)]))
+            return fragments
+        return self.choice_index.memoize(('filter', self.lookup_kwarg), build)
+
+    def get_counts(self, cl):
+        """
+        Return a dict mapping the (text) values of the field in the changelist
+        queryset to the number of rows with that value.
+        """
+        queryset = cl.queryset.order_by()
+        try:
+            sql, params = queryset.query.sql_with_params()
+        except EmptyResultSet:
+            return {}
+
+        if self.counts_cache_timeout is not None:
+            cache = caches[self.counts_cache_alias]
+            cache_key = 'lazychoices.counts.{0}'.format(
+                hashlib.md5(force_bytes('{0} {1} {2!r}'.format(self.field_path, sql, params))).hexdigest(),
+            )
+            counts = cache.get(cache_key)
+            if counts is not None:
+                stats.record('counts.hit', self.field.model, self.field.choices_name)
+                return counts
+            stats.record('counts.miss', self.field.model, self.field.choices_name)
+
+        counts = {}
+        for row in queryset.values(self.field_path).annotate(count=Count('pk')):
+            value = row[self.field_path]
+            counts[None if value is None else smart_text(value)] = row['count']
+
+        if self.counts_cache_timeout is not None:
+            cache.set(cache_key, counts, self.counts_cache_timeout)
+        return counts
 
     def choices(self, cl):
+        counts = self.get_counts(cl) if self.show_counts else None
         yield {
             'selected': self.lookup_val is None and not self.lookup_val_isnull,
             'query_string': cl.get_query_string({}, [self.lookup_kwarg, self.lookup_kwarg_isnull]),
-            'display': _('All'),
+            'display': self._with_count(_('All'), counts, total=True),
         }
+        # This builds the same query strings as cl.get_query_string(), but
+        # only encodes the parameters that are shared by every choice once.
+        params = [(k, v) for k, v in cl.params.items()
+                  if k != self.lookup_kwarg and not k.startswith(self.lookup_kwarg_isnull)]
+        before = urlencode(sorted((k, v) for k, v in params if k < self.lookup_kwarg))
+        after = urlencode(sorted((k, v) for k, v in params if k > self.lookup_kwarg))
+        fragments = self.get_lookup_fragments()
         for lookup, title in self.lookup_choices:
+            try:
+                text, fragment = fragments[lookup]
+            except (KeyError, TypeError):
+                text, fragment = smart_text(lookup), urlencode([(self.lookup_kwarg, lookup)])
             yield {
-                'selected': smart_text(lookup) == self.lookup_val,
-                'query_string': cl.get_query_string({
-                    self.lookup_kwarg: lookup,
-                }, [self.lookup_kwarg_isnull]),
-                'display': title,
+                'selected': text == self.lookup_val,
+                'query_string': '?' + '&'.join(part for part in (before, fragment, after) if part),
+                'display': self._with_count(title, counts, text),
             }
         if self.field.null:
             yield {
@@ -40,5 +111,61 @@ class LazyChoicesFieldListFilter(ChoicesFieldListFilter):
                 'query_string': cl.get_query_string({
                     self.lookup_kwarg_isnull: 'True',
                 }, [self.lookup_kwarg]),
-                'display': self.empty_value_display,
+                'display': self._with_count(self.empty_value_display, counts, None),
             }
+
+    def _with_count(self, display, counts, key=None, total=False):
+        if counts is None:
+            return display
+        count = sum(counts.values()) if total else counts.get(key, 0)
+        return '%s (%s)' % (force_text(display), count)
+
+
+class LazyChoicesOnlyFieldListFilter(LazyChoicesFieldListFilter):
+    """
+    Only offers the choices that are present in the rows of the admin's
+    queryset, found with a single ``DISTINCT`` query over the column.
+    """
+    # The number of seconds to cache the present values for, or None to not
+    # cache them.
+    values_cache_timeout = 300
+    values_cache_alias = DEFAULT_CACHE_ALIAS
+
+    def field_choices(self, field, request, model_admin):
+        index = self.choice_index
+        present = []
+        for value in self.get_present_values(field, request, model_admin):
+            if value in index.order:
+                present.append((index.order[value], value))
+        return [(value, index.labels[value]) for position, value in sorted(present)]
+
+    def get_present_values(self, field, request, model_admin):
+        """
+        Return the distinct non-null values of the field in the rows of
+        ``model_admin.get_queryset(request)``, so that rows the user can't
+        see don't contribute any values.
+        """
+        queryset = model_admin.get_queryset(request).order_by().values_list(self.field_path, flat=True).distinct()
+        try:
+            sql, params = queryset.query.sql_with_params()
+        except EmptyResultSet:
+            return []
+
+        if self.values_cache_timeout is not None:
+            # The query is part of the key, as the admin's queryset can depend
+            # on the request (e.g. on the user).
+            cache = caches[self.values_cache_alias]
+            cache_key = 'lazychoices.values.{0}'.format(
+                hashlib.md5(force_bytes('{0} {1} {2!r}'.format(self.field_path, sql, params))).hexdigest(),
+            )
+            values = cache.get(cache_key)
+            if values is not None:
+                stats.record('values.hit', field.model, field.choices_name)
+                return values
+            stats.record('values.miss', field.model, field.choices_name)
+
+        values = [value for value in queryset if value is not None]
+
+        if self.values_cache_timeout is not None:
+            cache.set(cache_key, values, self.values_cache_timeout)
+        return values
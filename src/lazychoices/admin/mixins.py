@@ -1,11 +1,64 @@
-from django.contrib.admin.options import InlineModelAdmin
+from django.contrib.admin.options import BaseModelAdmin, InlineModelAdmin, ModelAdmin
+from django.contrib.admin.views.main import ChangeList
+from django.core.exceptions import FieldDoesNotExist, PermissionDenied
+from django.core.urlresolvers import reverse_lazy
+from django.http import Http404, JsonResponse
+from django.utils import six
+from django.utils.encoding import force_text
 
-from lazychoices.forms import LazyChoiceInlineFormSet
+from lazychoices.choices import get_choice_index
+from lazychoices.forms import LazyChoiceAutocomplete, LazyChoiceInlineFormSet
+from lazychoices.models import LazyChoiceField, display_case
 
 from .checks import LazyChoiceInlineModelAdminChecks
 
 
-class LazyChoiceInlineModelAdminMixin(InlineModelAdmin):
+class LazyChoiceChangeList(ChangeList):
+    """
+    Only annotates the labels of the lazy choice columns that the changelist
+    is ordered by, so that other requests don't pay for the ``CASE``
+    expressions.
+    """
+
+    def get_queryset(self, request):
+        queryset = super(LazyChoiceChangeList, self).get_queryset(request)
+        ordering = set(
+            name.lstrip('-') for name in queryset.query.order_by if isinstance(name, six.string_types)
+        )
+        for column in self.list_display:
+            field = getattr(column, 'lazy_field', None)
+            if field is not None and column.admin_order_field in ordering:
+                queryset = queryset.annotate(**{column.admin_order_field: display_case(self.model, field.name)})
+        return queryset
+
+
+class LazyChoiceAutocompleteMixin(BaseModelAdmin):
+    # The names of the lazy choice fields to edit with an autocomplete widget
+    # instead of a select box, for choices that are too many to render.
+    lazy_autocomplete_fields = ()
+    lazy_autocomplete_page_size = 20
+
+    def formfield_for_choice_field(self, db_field, request=None, **kwargs):
+        if db_field.name in self.lazy_autocomplete_fields and 'widget' not in kwargs:
+            kwargs['widget'] = LazyChoiceAutocomplete(url=self.get_lazy_autocomplete_url(db_field))
+        return super(LazyChoiceAutocompleteMixin, self).formfield_for_choice_field(db_field, request, **kwargs)
+
+    def get_lazy_autocomplete_url(self, db_field):
+        raise NotImplementedError('subclasses of LazyChoiceAutocompleteMixin must provide a '
+                                  'get_lazy_autocomplete_url() method')
+
+    def get_lazy_choices_model(self):
+        """
+        Return the model class whose choices are searched.
+        """
+        return self.model
+
+
+class LazyChoiceInlineModelAdminMixin(LazyChoiceAutocompleteMixin, InlineModelAdmin):
+    """
+    The ``lazy_autocomplete_fields`` of an inline are searched through the
+    parent's ``ModelAdmin``, which must use ``LazyChoiceModelAdminMixin``.
+    """
     checks_class = LazyChoiceInlineModelAdminChecks
     formset = LazyChoiceInlineFormSet
 
@@ -13,3 +66,121 @@ class LazyChoiceInlineModelAdminMixin(InlineModelAdmin):
         formset = super(LazyChoiceInlineModelAdminMixin, self).get_formset(request, obj, **kwargs)
         formset.lazy_model = self.lazy_model
         return formset
+
+    def get_lazy_autocomplete_url(self, db_field):
+        parent_opts = self.parent_model._meta
+        return reverse_lazy(
+            '{0}:{1}_{2}_lazychoices'.format(self.admin_site.name, parent_opts.app_label, parent_opts.model_name),
+            kwargs={'app_label': self.opts.app_label, 'model_name': self.opts.model_name, 'field_name': db_field.name},
+        )
+
+    def get_lazy_choices_model(self):
+        return self.lazy_model
+
+
+class LazyChoiceModelAdminMixin(LazyChoiceAutocompleteMixin, ModelAdmin):
+    """
+    Displays the ``LazyChoiceField`` columns in ``list_display`` by their
+    labels and sorts them by label in the database.
+
+    Also serves the searches of the ``lazy_autocomplete_fields`` of the model
+    and its inlines, as paginated JSON.
+    """
+    # The fields exported by the actions of lazychoices.admin.actions, or
+    # None for all the concrete fields, and how many rows they read at once.
+    lazy_export_fields = None
+    lazy_export_chunk_size = 2000
+
+    def get_urls(self):
+        from django.conf.urls import url
+
+        info = self.model._meta.app_label, self.model._meta.model_name
+        urlpatterns = [
+            url(
+                r'^lazychoices/(?P<app_label>\w+)/(?P<model_name>\w+)/(?P<field_name>\w+)/$',
+                self.admin_site.admin_view(self.lazy_autocomplete_view),
+                name='{0}_{1}_lazychoices'.format(*info),
+            ),
+        ]
+        # The view must come before the catch-all URL of the change view.
+        return urlpatterns + super(LazyChoiceModelAdminMixin, self).get_urls()
+
+    def get_lazy_export_fields(self, request):
+        if self.lazy_export_fields is None:
+            return [field.attname for field in self.opts.concrete_fields]
+        return self.lazy_export_fields
+
+    def get_lazy_autocomplete_url(self, db_field):
+        return reverse_lazy(
+            '{0}:{1}_{2}_lazychoices'.format(self.admin_site.name, self.opts.app_label, self.opts.model_name),
+            kwargs={'app_label': self.opts.app_label, 'model_name': self.opts.model_name, 'field_name': db_field.name},
+        )
+
+    def lazy_autocomplete_view(self, request, app_label, model_name, field_name):
+        """
+        Return the choices of a field in ``lazy_autocomplete_fields`` whose
+        value or label contains the ``term`` parameter, a ``page`` at a time.
+        """
+        for model_admin in [self] + list(self.get_inline_instances(request)):
+            opts = model_admin.model._meta
+            if (opts.app_label, opts.model_name) == (app_label, model_name):
+                if field_name in getattr(model_admin, 'lazy_autocomplete_fields', ()):
+                    break
+        else:
+            raise Http404('No lazy autocomplete field {0} on {1}.{2}.'.format(field_name, app_label, model_name))
+
+        if not model_admin.has_change_permission(request) and not model_admin.has_add_permission(request):
+            raise PermissionDenied
+
+        field = model_admin.model._meta.get_field(field_name)
+        try:
+            page = max(int(request.GET.get('page', 1)), 1)
+        except ValueError:
+            page = 1
+        page_size = model_admin.lazy_autocomplete_page_size
+
+        index = get_choice_index(model_admin.get_lazy_choices_model(), field.choices_name)
+        results, more = index.search(request.GET.get('term', ''), (page - 1) * page_size, page_size)
+        return JsonResponse({
+            'results': [{'id': force_text(key), 'text': force_text(label)} for key, label in results],
+            'more': more,
+        })
+
+    def get_list_display(self, request):
+        list_display = super(LazyChoiceModelAdminMixin, self).get_list_display(request)
+        return [self._get_lazy_display_column(name) or name for name in list_display]
+
+    def get_list_display_links(self, request, list_display):
+        list_display_links = super(LazyChoiceModelAdminMixin, self).get_list_display_links(request, list_display)
+        if list_display_links is None:
+            return None
+        return [self._get_lazy_display_column(name) or name for name in list_display_links]
+
+    def get_changelist(self, request, **kwargs):
+        return LazyChoiceChangeList
+
+    def _get_lazy_display_column(self, name):
+        if name in self.list_editable:
+            # The changelist only renders the inputs of the columns that are
+            # named after their field.
+            return None
+        if not hasattr(self, '_lazy_display_columns'):
+            self._lazy_display_columns = {}
+        if name not in self._lazy_display_columns:
+            try:
+                field = self.model._meta.get_field(name)
+            except FieldDoesNotExist:
+                field = None
+            if isinstance(field, LazyChoiceField):
+                self._lazy_display_columns[name] = self._make_lazy_display_column(field)
+            else:
+                self._lazy_display_columns[name] = None
+        return self._lazy_display_columns[name]
+
+    def _make_lazy_display_column(self, field):
+        def column(obj):
+            return getattr(obj, 'get_{0}_display'.format(field.name))()
+        column.admin_order_field = '{0}_display'.format(field.name)
+        column.lazy_field = field
+        column.short_description = field.verbose_name
+        return column
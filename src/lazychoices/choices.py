@@ -0,0 +1,363 @@
+import time
+
+from django.core.cache import caches
+from django.utils.encoding import force_text
+from django.utils.translation import get_language
+
+from lazychoices import stats
+from lazychoices.signals import choices_invalidated
+
+
+class ChoiceProvider(object):
+    """
+    A source of choices that are loaded when needed instead of being declared
+    statically, e.g. from a settings table or a file.
+
+    Assign a provider to ``<NAME>_CHOICES`` with either a ``func`` that takes
+    the model class and returns its choices, or a subclass that overrides
+    ``load()``. The loaded choices are kept per model class for ``timeout``
+    seconds (forever if it's None) and, if a ``cache_alias`` is given, shared
+    with other processes through that cache. In that case the version of the
+    choices in the cache is checked at most every ``version_check_interval``
+    seconds (never if it's None), so that ``invalidate()`` in one process is
+    seen by the others before their choices expire.
+    """
+
+    def __init__(self, func=None, timeout=None, cache_alias=None, version_check_interval=5):
+        self.func = func
+        self.timeout = timeout
+        self.cache_alias = cache_alias
+        self.version_check_interval = version_check_interval
+
+    def load(self, model):
+        if self.func is None:
+            raise NotImplementedError('subclasses of ChoiceProvider must provide a load() method')
+        return self.func(model)
+
+    def get_cache_key(self, model, choices_name):
+        return 'lazychoices.choices.{0}.{1}.{2}'.format(model.__module__, model.__name__, choices_name)
+
+    def get_version(self, model, choices_name):
+        """
+        Return the version of the choices in the cache, or None if there's no
+        cache.
+        """
+        if self.cache_alias is None:
+            return None
+        return caches[self.cache_alias].get(self.get_cache_key(model, choices_name) + '.version', 0)
+
+    def get_choices(self, model, choices_name, version=None):
+        if self.cache_alias is None:
+            return self.load(model)
+
+        # The version is part of the key, so that invalidating the choices in
+        # one process makes every process load them again.
+        cache = caches[self.cache_alias]
+        cache_key = self.get_cache_key(model, choices_name)
+        if version is None:
+            version = self.get_version(model, choices_name)
+        choices = cache.get(cache_key, version=version)
+        if choices is None:
+            stats.record('provider.miss', model, choices_name)
+            # A generator can't be pickled into the cache.
+            choices = tuple(self.load(model))
+            cache.set(cache_key, choices, self.timeout, version=version)
+        else:
+            stats.record('provider.hit', model, choices_name)
+        return choices
+
+    def invalidate(self, model, choices_name):
+        if self.cache_alias is None:
+            return
+
+        cache = caches[self.cache_alias]
+        version_key = self.get_cache_key(model, choices_name) + '.version'
+        cache.add(version_key, 0, None)
+        try:
+            cache.incr(version_key)
+        except ValueError:
+            # The key was evicted in the meantime.
+            cache.set(version_key, 1, None)
+
+    def get_expiry(self):
+        if self.timeout is None:
+            return None
+        return time.time() + self.timeout
+
+    def get_version_check(self):
+        """
+        Return the time after which the version of the choices should be
+        checked, or None if it's never checked.
+        """
+        if self.cache_alias is None or self.version_check_interval is None:
+            return None
+        return time.time() + self.version_check_interval
+
+
+class ChoiceIndex(object):
+    """
+    A compiled, read-only view of a ``<NAME>_CHOICES`` attribute.
+
+    The choices are flattened once and the lookups that are needed on every
+    validation, display or filter render are precomputed, so that they don't
+    need to walk the choices again.
+    """
+
+    def __init__(self, choices, source=None, expires=None, version=None, version_check=None):
+        # The choices can be any iterable, e.g. a generator that can only be
+        # consumed once.
+        self.choices = tuple(choices)
+        self.source = choices if source is None else source
+        self.expires = expires
+        self.version = version
+        self.version_check = version_check
+        flat = []
+        labels = {}
+        groups = {}
+        order = {}
+        unhashable = []
+        for option_key, option_value in self.choices:
+            if isinstance(option_value, (list, tuple)):
+                options = [(key, value, option_key) for key, value in option_value]
+            else:
+                options = [(option_key, option_value, None)]
+            for key, value, group in options:
+                try:
+                    # The last label of a duplicated key wins, as it does
+                    # with dict(flatten_choices(choices)).
+                    labels[key] = value
+                    groups.setdefault(key, group)
+                    order.setdefault(key, len(flat))
+                except TypeError:
+                    # Unhashable keys can't be looked up, but they are still
+                    # valid choices.
+                    unhashable.append(key)
+                flat.append((key, value))
+        self.flat = tuple(flat)
+        self.labels = labels
+        self.groups = groups
+        self.order = order
+        self.keys = frozenset(labels)
+        self.unhashable = tuple(unhashable)
+        self._memo = {}
+
+    def __contains__(self, value):
+        try:
+            if value in self.keys:
+                return True
+        except TypeError:
+            return any(value == key for key, label in self.flat)
+        return any(value == key for key in self.unhashable)
+
+    def __iter__(self):
+        return iter(self.flat)
+
+    def __len__(self):
+        return len(self.flat)
+
+    def memoize(self, key, func):
+        """
+        Return the result of ``func()``, computed once per index and ``key``.
+
+        Data derived from the choices is cached here so that it is discarded
+        along with the index when the choices change.
+        """
+        try:
+            value = self._memo[key]
+        except KeyError:
+            stats.record('memo.miss')
+            value = self._memo[key] = func()
+        else:
+            stats.record('memo.hit')
+        return value
+
+    def get_label(self, value, default=None):
+        try:
+            return self.labels.get(value, default)
+        except TypeError:
+            return default
+
+    def get_keys(self, label):
+        """
+        Return the keys of the choices that are displayed with the (text)
+        label ``label``, in order. The reverse index is built once per
+        language.
+        """
+        def build():
+            keys = {}
+            for key, value in self.flat:
+                if self.get_label(key, value) is not value:
+                    # The key is displayed with a later label.
+                    continue
+                keys.setdefault(force_text(value), []).append(key)
+            return dict((value, tuple(value_keys)) for value, value_keys in keys.items())
+        return self.memoize(('keys', get_language()), build).get(force_text(label), ())
+
+    def search(self, term, offset=0, limit=None):
+        """
+        Return the choices whose key or label contains ``term`` (ignoring case),
+        from ``offset`` and up to ``limit`` of them, along with whether there
+        are more. The search index is built once per language.
+        """
+        search_index = self.memoize(('search', get_language()), lambda: ChoiceSearchIndex(self.flat))
+        return search_index.search(term, offset, limit)
+
+
+class ChoiceSearchIndex(object):
+    """
+    A case-insensitive substring index over the keys and labels of flat
+    choices.
+
+    The choices that contain each character and pair of characters are
+    recorded up front, so that a search only has to look at the choices that
+    contain the rarest pair of characters of the term instead of at every
+    choice.
+    """
+
+    def __init__(self, choices):
+        self.choices = tuple(choices)
+        self.texts = []
+        self.grams = {}
+        for i, (key, label) in enumerate(self.choices):
+            text = self._normalize(force_text(key) + '\t' + force_text(label))
+            self.texts.append(text)
+            for gram in set(text).union(a + b for a, b in zip(text, text[1:])):
+                self.grams.setdefault(gram, []).append(i)
+
+    def _normalize(self, text):
+        return text.replace('\n', ' ').lower()
+
+    def search(self, term, offset=0, limit=None):
+        term = self._normalize(force_text(term)).replace('\t', ' ')
+        if not term:
+            candidates = range(len(self.choices))
+        else:
+            try:
+                candidates = min(
+                    (self.grams[term[j:j + 2]] for j in range(max(len(term) - 1, 1))),
+                    key=len,
+                )
+            except KeyError:
+                return [], False
+
+        results = []
+        texts = self.texts
+        for i in candidates:
+            if term in texts[i]:
+                if offset:
+                    offset -= 1
+                elif limit is not None and len(results) == limit:
+                    return results, True
+                else:
+                    results.append(self.choices[i])
+        return results, False
+
+
+def get_choice_index(model, choices_name):
+    """
+    Return the ``ChoiceIndex`` for the ``choices_name`` attribute of a model
+    class or instance.
+
+    The index is built once per class and stored on the class itself, so that
+    subclasses with their own choices get their own index. It is reused until
+    the attribute is reassigned or, for a ``ChoiceProvider``, until its
+    timeout expires or the version of its cached choices changes; choices
+    that are mutated in place are not detected.
+    """
+    started = stats.start()
+    source = getattr(model, choices_name, ())
+    klass = model if isinstance(model, type) else type(model)
+    indexes = klass.__dict__.get('_choice_indexes')
+    if indexes is None:
+        indexes = {}
+        try:
+            klass._choice_indexes = indexes
+        except TypeError:
+            # Built-in types (e.g. when validating without a model instance)
+            # can't hold the cache.
+            pass
+    index = indexes.get(choices_name)
+    now = time.time()
+    stale = (index is None or index.source is not source or
+             (index.expires is not None and index.expires <= now))
+    if not stale and index.version_check is not None and index.version_check <= now:
+        # Another process may have invalidated the cached choices.
+        stale = source.get_version(klass, choices_name) != index.version
+        index.version_check = source.get_version_check()
+    if stale:
+        stats.record('lookup.miss' if index is None else 'lookup.rebuild', klass, choices_name)
+        if isinstance(source, ChoiceProvider):
+            version = source.get_version(klass, choices_name)
+            index = ChoiceIndex(
+                source.get_choices(klass, choices_name, version), source, source.get_expiry(),
+                version, source.get_version_check(),
+            )
+        else:
+            index = ChoiceIndex(source)
+        indexes[choices_name] = index
+    else:
+        stats.record('lookup.hit', klass, choices_name)
+    stats.record('lookup', klass, choices_name, started)
+    return index
+
+
+def get_subclasses(model):
+    """
+    Return all the subclasses of a class, however deep they are.
+    """
+    subclasses = []
+    seen = set()
+    classes = model.__subclasses__()
+    while classes:
+        klass = classes.pop()
+        if klass not in seen:
+            seen.add(klass)
+            subclasses.append(klass)
+            classes.extend(klass.__subclasses__())
+    return subclasses
+
+
+def get_label_keys(model, choices_name, label):
+    """
+    Return the keys whose label is ``label`` in the ``choices_name`` choices
+    of a model class or any of its subclasses, e.g. to query the rows that
+    are displayed with that label.
+    """
+    keys = []
+    for klass in [model] + get_subclasses(model):
+        for key in get_choice_index(klass, choices_name).get_keys(label):
+            if key not in keys:
+                keys.append(key)
+    return keys
+
+
+def invalidate(model, field=None):
+    """
+    Discard the compiled choices of a model class and its subclasses, for the
+    lazy choice field named ``field`` or for all of them, so that they are
+    rebuilt when they are next used.
+
+    Choices loaded by a ``ChoiceProvider`` with a ``cache_alias`` are also
+    invalidated in that cache, so that other processes load them again once
+    they check its version (see ``ChoiceProvider``).
+    """
+    if field is not None:
+        choices_names = ['{0}_CHOICES'.format(field.upper())]
+    else:
+        choices_names = None
+
+    for klass in [model] + get_subclasses(model):
+        indexes = klass.__dict__.get('_choice_indexes', {})
+        if choices_names is not None:
+            names = choices_names
+        else:
+            names = set(indexes)
+            if hasattr(klass, '_meta'):
+                names.update(f.choices_name for f in klass._meta.fields if hasattr(f, 'choices_name'))
+        for name in names:
+            indexes.pop(name, None)
+            source = getattr(klass, name, None)
+            if isinstance(source, ChoiceProvider):
+                source.invalidate(klass, name)
+
+    choices_invalidated.send(sender=model, field=field)
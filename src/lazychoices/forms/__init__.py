@@ -1,2 +1,3 @@
 from .fields import LazyChoiceField  # noqa
 from .models import LazyChoiceInlineFormSet, LazyChoiceModelForm  # noqa
+from .widgets import LazyChoiceAutocomplete, LazyChoiceSelect  # noqa
@@ -1,7 +1,41 @@
-from django.forms import TypedChoiceField
+from django.forms import ChoiceField, TypedChoiceField
+from django.utils.encoding import force_text
+
+from lazychoices.choices import get_choice_index
+from lazychoices.utils import flatten_choices
+
+from .widgets import LazyChoiceSelect
+
+
+class ModelChoices(object):
+    """
+    The choices of a form field for a model, shared by every field (and form
+    instance) that uses them, along with their text values for validation.
+    """
+
+    def __init__(self, choices):
+        self.choices = tuple(choices)
+        self.text_values = frozenset(force_text(key) for key, label in flatten_choices(self.choices))
+        # The rendered options, filled in by LazyChoiceSelect.
+        self.rendered = {}
+        self._options = None
+
+    def get_option(self, text):
+        """
+        Return the first ``(value, label)`` choice with the given text value,
+        or None if there isn't one.
+        """
+        if self._options is None:
+            options = {}
+            for key, label in flatten_choices(self.choices):
+                options.setdefault(force_text('' if key is None else key), (key, label))
+            self._options = options
+        return self._options.get(text)
 
 
 class LazyChoiceField(TypedChoiceField):
+    widget = LazyChoiceSelect
+
     def __init__(self, choices_name, model=None, empty_label='---------', *args, **kwargs):
         super(LazyChoiceField, self).__init__(*args, **kwargs)
         self.choices_name = choices_name
@@ -9,7 +43,9 @@ class LazyChoiceField(TypedChoiceField):
         self.model = model
 
     def __deepcopy__(self, memo):
-        result = super(LazyChoiceField, self).__deepcopy__(memo)
+        # The choices are immutable and shared, so skip the deep copy of them
+        # that ChoiceField.__deepcopy__() would make.
+        result = super(ChoiceField, self).__deepcopy__(memo)
         result.model = result.model
         return result
 
@@ -18,13 +54,24 @@ class LazyChoiceField(TypedChoiceField):
 
     def _set_model(self, model):
         self._model = model
-        self.choices = self._get_model_choices(model)
+        self._model_choices = self._get_model_choices(model)
+        # Bypass the choices setter, which would copy them into a new list.
+        self._choices = self.widget.choices = self._model_choices.choices
+        if isinstance(self.widget, LazyChoiceSelect):
+            self.widget.model_choices = self._model_choices
 
     model = property(_get_model, _set_model)
 
     def _get_model_choices(self, model):
         if self.required and (self.initial is not None):
-            first_choice = []
+            first_choice = ()
         else:
-            first_choice = [(self.empty_value, self.empty_label)]
-        return first_choice + getattr(model, self.choices_name, [])
+            first_choice = ((self.empty_value, self.empty_label),)
+        index = get_choice_index(model, self.choices_name)
+        return index.memoize(('formfield', first_choice), lambda: ModelChoices(first_choice + tuple(index.choices)))
+
+    def valid_value(self, value):
+        if self._choices is not self._model_choices.choices:
+            # The choices have been replaced since the model was set.
+            return super(LazyChoiceField, self).valid_value(value)
+        return force_text(value) in self._model_choices.text_values
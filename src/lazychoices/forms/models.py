@@ -1,4 +1,6 @@
 from django.forms import BaseInlineFormSet, ModelForm
+from django.utils import six
+from django.utils.functional import cached_property
 
 from .fields import LazyChoiceField
 
@@ -6,7 +8,17 @@ from .fields import LazyChoiceField
 class LazyChoiceInlineFormSet(BaseInlineFormSet):
     lazy_model = None
 
+    @cached_property
+    def management_form(self):
+        # Django rebuilds the management form on every call to
+        # initial_form_count(), which happens several times per form.
+        return super(LazyChoiceInlineFormSet, self).management_form
+
     def _construct_form(self, i, **kwargs):
+        # Hand the lazy model to the form's constructor, so that its fields
+        # are only pointed at the choices once.
+        if self.lazy_model is not None and issubclass(self.form, LazyChoiceModelForm):
+            kwargs['lazy_model'] = self.lazy_model
         form = super(LazyChoiceInlineFormSet, self)._construct_form(i, **kwargs)
         form.lazy_model = self.lazy_model
         return form
@@ -20,17 +32,47 @@ class LazyChoiceInlineFormSet(BaseInlineFormSet):
 
 class LazyChoiceModelForm(ModelForm):
     def __init__(self, *args, **kwargs):
+        lazy_model = kwargs.pop('lazy_model', None)
         super(LazyChoiceModelForm, self).__init__(*args, **kwargs)
-        self.lazy_model = self.instance._meta.model
+        self.lazy_model = lazy_model or self.instance._meta.model
+
+    @classmethod
+    def _get_lazy_field_names(cls):
+        # The names are recorded once per form class, so that setting the
+        # lazy model doesn't have to inspect every field of every instance.
+        names = cls.__dict__.get('_lazy_field_names')
+        if names is None:
+            names = cls._lazy_field_names = tuple(
+                name for name, field in cls.base_fields.items() if isinstance(field, LazyChoiceField)
+            )
+        return names
 
     def _get_lazy_model(self):
         return self._lazy_model
 
+    def _get_added_lazy_field_names(self):
+        # Fields added to the form by a constructor aren't in base_fields.
+        base_fields = self.base_fields
+        return tuple(
+            name for name, field in self.fields.items()
+            if name not in base_fields and isinstance(field, LazyChoiceField)
+        )
+
     def _set_lazy_model(self, lazy_model):
+        fields = self.fields
+        if (self.__dict__.get('_lazy_model', None) is lazy_model and
+                six.viewkeys(fields) == self._lazy_field_keys):
+            # Neither the model nor the fields changed since it was set.
+            return
         self._lazy_model = lazy_model
-        for field_name in self.fields:
-            formfield = self.fields[field_name]
-            if isinstance(formfield, LazyChoiceField):
+        self._lazy_field_keys = frozenset(fields)
+        names = self._get_lazy_field_names()
+        if six.viewkeys(fields) != six.viewkeys(self.base_fields):
+            names += self._get_added_lazy_field_names()
+        for field_name in names:
+            # A constructor may have replaced a lazy field with another one.
+            formfield = fields.get(field_name)
+            if isinstance(formfield, LazyChoiceField) and formfield.model is not lazy_model:
                 formfield.model = lazy_model
 
     lazy_model = property(_get_lazy_model, _set_lazy_model)
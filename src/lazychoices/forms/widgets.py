@@ -0,0 +1,123 @@
+from django.forms import Select
+from django.utils.encoding import force_text
+from django.utils.html import format_html
+from django.utils.translation import get_language
+
+from lazychoices import stats
+
+
+class LazyChoiceSelect(Select):
+    """
+    A select widget that renders the options of the shared model choices
+    only once per language, and then only renders the selected options.
+    """
+    model_choices = None
+
+    def render_options(self, choices, selected_choices):
+        model_choices = self.model_choices
+        if choices or model_choices is None or self.choices is not model_choices.choices:
+            return super(LazyChoiceSelect, self).render_options(choices, selected_choices)
+
+        key = (type(self), get_language())
+        try:
+            html, spans = model_choices.rendered[key]
+        except KeyError:
+            stats.record('render.miss')
+            html, spans = model_choices.rendered[key] = self._render_unselected_options()
+        else:
+            stats.record('render.hit')
+
+        patches = []
+        for text in set(force_text(v) for v in selected_choices):
+            option_spans = spans.get(text, [])
+            if not self.allow_multiple_selected:
+                # Only allow for a single selection.
+                option_spans = option_spans[:1]
+            patches.extend(option_spans)
+
+        output = []
+        last = 0
+        for start, end, text, option_value, option_label in sorted(patches):
+            output.append(html[last:start])
+            output.append(self.render_option({text}, option_value, option_label))
+            last = end
+        output.append(html[last:])
+        return ''.join(output)
+
+    def _render_unselected_options(self):
+        """
+        Render the options with nothing selected, and return the output along
+        with a dict mapping the text value of each option to the spans of the
+        output where it was rendered.
+        """
+        lines = []
+        options = []
+        for option_value, option_label in self.choices:
+            if isinstance(option_label, (list, tuple)):
+                lines.append(format_html('<optgroup label="{}">', force_text(option_value)))
+                for option in option_label:
+                    options.append((len(lines),) + tuple(option))
+                    lines.append(self.render_option(set(), *option))
+                lines.append('</optgroup>')
+            else:
+                options.append((len(lines), option_value, option_label))
+                lines.append(self.render_option(set(), option_value, option_label))
+
+        starts = []
+        position = 0
+        for line in lines:
+            starts.append(position)
+            position += len(line) + 1
+
+        spans = {}
+        for i, option_value, option_label in options:
+            text = force_text('' if option_value is None else option_value)
+            spans.setdefault(text, []).append((starts[i], starts[i] + len(lines[i]), text, option_value, option_label))
+        return '\n'.join(lines), spans
+
+
+class LazyChoiceAutocomplete(LazyChoiceSelect):
+    """
+    A select widget that only renders the empty and selected options, for
+    choices that are too many to render in full. The other options are
+    searched as the user types, with the JSON view at ``url`` (see
+    ``LazyChoiceModelAdminMixin.lazy_autocomplete_fields``).
+    """
+
+    class Media:
+        js = ('lazychoices/autocomplete.js',)
+
+    def __init__(self, url=None, attrs=None, choices=()):
+        super(LazyChoiceAutocomplete, self).__init__(attrs, choices)
+        self.url = url
+
+    def render(self, name, value, attrs=None, *args, **kwargs):
+        attrs = dict(attrs or {})
+        if self.url is not None:
+            attrs['data-lazychoices-url'] = force_text(self.url)
+        return super(LazyChoiceAutocomplete, self).render(name, value, attrs, *args, **kwargs)
+
+    def render_options(self, choices, selected_choices):
+        model_choices = self.model_choices
+        if choices or model_choices is None or self.choices is not model_choices.choices:
+            return super(LazyChoiceAutocomplete, self).render_options(choices, selected_choices)
+
+        texts = []
+        if model_choices.choices:
+            # Keep the empty option, so that the value can be cleared.
+            option_value, option_label = model_choices.choices[0]
+            if option_value in ('', None) and not isinstance(option_label, (list, tuple)):
+                texts.append(force_text('' if option_value is None else option_value))
+        for text in (force_text(v) for v in selected_choices):
+            if text not in texts:
+                texts.append(text)
+                if not self.allow_multiple_selected:
+                    break
+
+        output = []
+        selected = set(force_text(v) for v in selected_choices)
+        for text in texts:
+            option = model_choices.get_option(text)
+            if option is not None:
+                output.append(self.render_option(selected, *option))
+        return '\n'.join(output)
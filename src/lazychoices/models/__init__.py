@@ -1,2 +1,3 @@
-from .fields import LazyChoiceField  # noqa
-from .mixins import LazyChoiceModelMixin  # noqa
+from .fields import CodedLazyChoiceField, LazyChoiceField  # noqa
+from .mixins import LazyChoiceModelMixin, resolve_displays  # noqa
+from .query import LazyChoiceQuerySet, display_case  # noqa
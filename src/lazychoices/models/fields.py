@@ -1,3 +1,6 @@
+import logging
+import time
+
 from django.core import checks, exceptions
 from django.db.models import BLANK_CHOICE_DASH, CharField
 from django.utils import six
@@ -5,29 +8,49 @@ from django.utils.functional import curry
 from django.utils.itercompat import is_iterable
 from django.utils.text import capfirst
 
-from lazychoices import forms
+from lazychoices import forms, stats
+from lazychoices.choices import ChoiceProvider, get_choice_index, get_subclasses
 
+from .lookups import CodedExact, CodedIn, Label
 from .mixins import LazyChoiceModelMixin
 
+logger = logging.getLogger('lazychoices')
+
 
 class LazyChoiceField(CharField):
     def __init__(self, *args, **kwargs):
+        # With check_choices=True the column gets a CHECK constraint limiting
+        # it to the keys of the choices of the model and its subclasses.
+        self.check_choices = kwargs.pop('check_choices', False)
         kwargs.setdefault('choices', BLANK_CHOICE_DASH)
         kwargs.setdefault('max_length', 25)
         super(LazyChoiceField, self).__init__(*args, **kwargs)
 
     def check(self, **kwargs):
+        started = time.time()
         errors = super(LazyChoiceField, self).check(**kwargs)
         errors.extend(self._check_model())
-        for subclass in self.model.__subclasses__():
+        subclasses = self._get_subclasses()
+        for subclass in subclasses:
             errors.extend(self._check_choices(subclass))
+        logger.debug(
+            'Checked %s.%s.%s and %d subclasses in %.3fs.',
+            self.model._meta.app_label, self.model._meta.object_name, self.name,
+            len(subclasses), time.time() - started,
+        )
         return errors
 
+    def _get_subclasses(self):
+        return get_subclasses(self.model)
+
     def _check_choices(self, klass=None):
         klass = klass or self.model
         if hasattr(klass, self.choices_name):
             choices = getattr(klass, self.choices_name)
-            if (isinstance(choices, six.string_types) or not is_iterable(choices)):
+            if isinstance(choices, ChoiceProvider):
+                # Provided choices are only loaded when they are needed.
+                return []
+            elif (isinstance(choices, six.string_types) or not is_iterable(choices)):
                 return [
                     checks.Error(
                         "'{0}' must be an iterable (e.g., a list or tuple).".format(self.choices_name),
@@ -36,9 +59,16 @@ class LazyChoiceField(CharField):
                         id='lazychoices.E001',
                     ),
                 ]
-            elif any(isinstance(choice, six.string_types) or
-                     not is_iterable(choice) or len(choice) != 2
-                     for choice in choices):
+
+            try:
+                if any(isinstance(choice, six.string_types) or
+                       not is_iterable(choice) or len(choice) != 2
+                       for choice in choices):
+                    raise ValueError
+                # The index is cached on the class, so the choices are only
+                # normalized once for the checks and the first request.
+                index = get_choice_index(klass, self.choices_name)
+            except (TypeError, ValueError):
                 return [
                     checks.Error(
                         ("'{0}' must be an iterable containing "
@@ -48,11 +78,49 @@ class LazyChoiceField(CharField):
                         id='lazychoices.E002',
                     ),
                 ]
-            else:
-                return []
+            return self._check_index(klass, index)
         else:
             return []
 
+    def _check_index(self, klass, index):
+        errors = []
+        too_long = [
+            key for key, label in index.flat
+            if isinstance(key, six.string_types) and len(key) > self.max_length
+        ]
+        if too_long:
+            errors.append(
+                checks.Error(
+                    "'{0}' contains values longer than 'max_length' ({1}): {2}.".format(
+                        self.choices_name, self.max_length, ', '.join(repr(key) for key in too_long),
+                    ),
+                    hint="Shorten the values or increase the field's 'max_length'.",
+                    obj=klass,
+                    id='lazychoices.E006',
+                ),
+            )
+
+        duplicates = []
+        for position, (key, label) in enumerate(index.flat):
+            try:
+                if index.order[key] != position:
+                    duplicates.append(key)
+            except TypeError:
+                # Unhashable keys can't be looked up in the index.
+                pass
+        if duplicates:
+            errors.append(
+                checks.Warning(
+                    "'{0}' contains duplicate values: {1}.".format(
+                        self.choices_name, ', '.join(repr(key) for key in duplicates),
+                    ),
+                    hint='Only the last label of each value is displayed.',
+                    obj=klass,
+                    id='lazychoices.W001',
+                ),
+            )
+        return errors
+
     def _check_model(self):
         if not issubclass(self.model, LazyChoiceModelMixin):
             return [
@@ -67,15 +135,41 @@ class LazyChoiceField(CharField):
             return []
 
     def validate(self, value, model_instance):
-        choices = getattr(model_instance, self.choices_name, [])
-        if choices and value not in self.empty_values:
-            for option_key, option_value in choices:
-                if isinstance(option_value, (list, tuple)):
-                    for optgroup_key, optgroup_value in option_value:
-                        if value == optgroup_key:
-                            return
-                elif value == option_key:
-                    return
+        started = stats.start()
+        try:
+            self._validate_choice(value, get_choice_index(model_instance, self.choices_name))
+        finally:
+            stats.record('validate', type(model_instance), self.choices_name, started)
+
+    def validate_many(self, instances):
+        """
+        Validate the value of this field on each of the given model instances,
+        resolving the choices only once per class.
+
+        ``instances`` may be any iterable and is consumed lazily. Yields an
+        ``(instance, error)`` pair for every instance with an invalid value.
+        """
+        indexes = {}
+        for instance in instances:
+            started = stats.start()
+            klass = type(instance)
+            index = indexes.get(klass)
+            if index is None:
+                index = indexes[klass] = get_choice_index(klass, self.choices_name)
+            try:
+                self._validate_choice(getattr(instance, self.attname), index)
+            except exceptions.ValidationError as e:
+                error = e
+            else:
+                error = None
+            stats.record('validate', klass, self.choices_name, started)
+            if error is not None:
+                yield instance, error
+
+    def _validate_choice(self, value, index):
+        if index and value not in self.empty_values:
+            if value in index:
+                return
 
             raise exceptions.ValidationError(
                 self.error_messages['invalid_choice'],
@@ -89,6 +183,51 @@ class LazyChoiceField(CharField):
         if not self.blank and value in self.empty_values:
             raise exceptions.ValidationError(self.error_messages['blank'], code='blank')
 
+    def deconstruct(self):
+        name, path, args, kwargs = super(LazyChoiceField, self).deconstruct()
+        if self.check_choices is True and hasattr(self, 'model'):
+            # The values are written out, so that changing the choices changes
+            # the field in the migrations and the constraint is altered.
+            kwargs['check_choices'] = self.get_check_values()
+        elif self.check_choices:
+            kwargs['check_choices'] = self.check_choices
+        return name, path, args, kwargs
+
+    def db_parameters(self, connection):
+        params = super(LazyChoiceField, self).db_parameters(connection)
+        values = self.get_check_values()
+        if values is not None:
+            check = '{0} IN ({1})'.format(
+                connection.ops.quote_name(self.column),
+                ', '.join(self._quote_check_value(self.get_prep_value(value)) for value in values),
+            )
+            params['check'] = check if params['check'] is None else '({0}) AND ({1})'.format(params['check'], check)
+        return params
+
+    def get_check_values(self):
+        """
+        Return the sorted values allowed by the CHECK constraint, or None if
+        the column isn't constrained.
+        """
+        if not self.check_choices:
+            return None
+        elif self.check_choices is not True:
+            return tuple(self.check_choices)
+
+        values = set([''] if self.blank else [])
+        for klass in [self.model] + self._get_subclasses():
+            if isinstance(getattr(klass, self.choices_name, None), ChoiceProvider):
+                # Provided choices can change at any time, so they can't be
+                # enforced by the database.
+                return None
+            values.update(get_choice_index(klass, self.choices_name).keys)
+        return tuple(sorted(values, key=six.text_type))
+
+    def _quote_check_value(self, value):
+        if isinstance(value, six.integer_types):
+            return six.text_type(value)
+        return "'{0}'".format(six.text_type(value).replace("'", "''"))
+
     def set_attributes_from_name(self, name):
         super(LazyChoiceField, self).set_attributes_from_name(name)
         self.choices_name = '{0}_CHOICES'.format(self.name.upper())
@@ -132,3 +271,143 @@ class LazyChoiceField(CharField):
         if form_class is None:
             form_class = forms.LazyChoiceField
         return form_class(**defaults)
+
+
+LazyChoiceField.register_lookup(Label)
+
+
+class CodedLazyChoiceField(LazyChoiceField):
+    """
+    A ``LazyChoiceField`` that stores a small integer code for each choice in
+    the database instead of its key, which is still used everywhere else.
+
+    ``codes`` maps every key of the choices (of the model and its subclasses)
+    to its code. It is part of the migrations, so the codes must not change
+    once data has been stored with them. Blank values have no code and are
+    stored as NULL, so ``blank=True`` requires ``null=True``; ``exact`` and
+    ``in`` lookups of ``''`` match them with ``IS NULL``. Lookups of keys
+    without a code match no rows.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.codes = dict(kwargs.pop('codes', None) or {})
+        self.keys = dict((code, key) for key, code in self.codes.items())
+        super(CodedLazyChoiceField, self).__init__(*args, **kwargs)
+
+    def check(self, **kwargs):
+        errors = super(CodedLazyChoiceField, self).check(**kwargs)
+        errors.extend(self._check_codes())
+        errors.extend(self._check_blank())
+        return errors
+
+    def _check_index(self, klass, index):
+        # The codes are stored instead of the values, so their length doesn't
+        # matter.
+        errors = [
+            error for error in super(CodedLazyChoiceField, self)._check_index(klass, index)
+            if error.id != 'lazychoices.E006'
+        ]
+        missing = [key for key, label in index if not self._has_code(key)]
+        if missing:
+            errors.append(
+                checks.Error(
+                    "'{0}' contains values without a code: {1}.".format(
+                        self.choices_name, ', '.join(repr(key) for key in missing),
+                    ),
+                    hint="Add a code for each value to the field's 'codes'.",
+                    obj=klass,
+                    id='lazychoices.E004',
+                ),
+            )
+        return errors
+
+    def _has_code(self, key):
+        try:
+            return key in self.codes
+        except TypeError:
+            # An unhashable key can't have a code.
+            return False
+
+    def _check_codes(self):
+        if len(self.keys) != len(self.codes) or not all(
+                isinstance(code, six.integer_types) and 0 <= code <= 32767 for code in self.keys):
+            return [
+                checks.Error(
+                    "'codes' must map each value to a unique integer between 0 and 32767.",
+                    hint=None,
+                    obj=self,
+                    id='lazychoices.E005',
+                ),
+            ]
+        else:
+            return []
+
+    def _check_blank(self):
+        if self.blank and not self.null:
+            return [
+                checks.Error(
+                    "'blank=True' requires 'null=True', as blank values are stored as NULL.",
+                    hint='Set null=True on the field.',
+                    obj=self,
+                    id='lazychoices.E007',
+                ),
+            ]
+        else:
+            return []
+
+    def deconstruct(self):
+        name, path, args, kwargs = super(CodedLazyChoiceField, self).deconstruct()
+        kwargs['codes'] = self.codes
+        return name, path, args, kwargs
+
+    def get_internal_type(self):
+        return 'PositiveSmallIntegerField'
+
+    def from_db_value(self, value, expression, connection, context):
+        if value is None:
+            return value
+        return self.keys.get(value, value)
+
+    def to_python(self, value):
+        if isinstance(value, six.integer_types) and value in self.keys:
+            return self.keys[value]
+        return super(CodedLazyChoiceField, self).to_python(value)
+
+    def get_check_values(self):
+        values = super(CodedLazyChoiceField, self).get_check_values()
+        if values is None:
+            return values
+        # Blank values are stored as NULL, and keys without a code are already
+        # reported by the system checks.
+        return tuple(value for value in values if value in self.codes)
+
+    def get_prep_value(self, value):
+        value = super(CodedLazyChoiceField, self).get_prep_value(value)
+        if value is None or value == '':
+            return None
+        try:
+            return self.codes[value]
+        except (KeyError, TypeError):
+            raise ValueError("'{0}' has no code in the field's 'codes'.".format(value))
+
+    def get_prep_lookup(self, lookup_type, value):
+        if hasattr(value, '_prepare'):
+            return super(CodedLazyChoiceField, self).get_prep_lookup(lookup_type, value)
+        # Keys without a code can't have been stored, so they match no rows
+        # instead of raising ValueError.
+        if lookup_type == 'exact':
+            return self._get_lookup_code(value)
+        elif lookup_type == 'in':
+            return [self._get_lookup_code(item) for item in value]
+        return super(CodedLazyChoiceField, self).get_prep_lookup(lookup_type, value)
+
+    def _get_lookup_code(self, value):
+        try:
+            return self.get_prep_value(value)
+        except ValueError:
+            # Codes are never negative.
+            return -1
+
+
+CodedLazyChoiceField.register_lookup(CodedExact)
+CodedLazyChoiceField.register_lookup(CodedIn)
@@ -0,0 +1,71 @@
+from django.db.models.lookups import Exact, In, IsNull, Lookup
+from django.utils import six
+
+from lazychoices.choices import get_label_keys
+
+
+class Label(Lookup):
+    """
+    Matches the rows that are displayed with the given label, e.g.
+    ``filter(category__label='Non-Fiction')``. The label is translated to the
+    keys that have it in the choices of the field's model and its subclasses,
+    so the query is a plain ``IN`` over the column.
+    """
+    lookup_name = 'label'
+
+    def get_prep_lookup(self):
+        return self.rhs
+
+    def as_sql(self, compiler, connection):
+        field = self.lhs.output_field
+        keys = get_label_keys(field.model, field.choices_name, self.rhs)
+        return In(self.lhs, keys).as_sql(compiler, connection)
+
+
+def _is_blank(value):
+    return isinstance(value, six.string_types) and value == ''
+
+
+class CodedExact(Exact):
+    """
+    The ``exact`` lookup of a ``CodedLazyChoiceField``, which stores blank
+    values as NULL, so that ``filter(category='')`` matches them with
+    ``IS NULL``.
+    """
+
+    def __new__(cls, lhs, rhs):
+        # The query is given an actual isnull lookup, so that exclude()
+        # doesn't add "AND col IS NOT NULL", which would keep the NULL rows.
+        if _is_blank(rhs):
+            return IsNull(lhs, True)
+        return super(CodedExact, cls).__new__(cls)
+
+
+class CodedIn(In):
+    """
+    The ``in`` lookup of a ``CodedLazyChoiceField``, which matches a blank
+    value among the values with ``IS NULL``.
+    """
+
+    def __new__(cls, lhs, rhs):
+        if not hasattr(rhs, '_prepare') and any(_is_blank(value) for value in rhs):
+            return BlankIn(lhs, rhs)
+        return super(CodedIn, cls).__new__(cls)
+
+
+class BlankIn(Lookup):
+    """
+    Matches ``(col IN (...) OR col IS NULL)``, for ``CodedIn``.
+    """
+    # Named like IsNull, for the same reason as in CodedExact.
+    lookup_name = 'isnull'
+
+    def get_prep_lookup(self):
+        return [value for value in self.rhs if not _is_blank(value)]
+
+    def as_sql(self, compiler, connection):
+        sql, params = IsNull(self.lhs, True).as_sql(compiler, connection)
+        if self.rhs:
+            in_sql, in_params = In(self.lhs, self.rhs).as_sql(compiler, connection)
+            sql, params = '({0} OR {1})'.format(in_sql, sql), list(in_params) + list(params)
+        return sql, params
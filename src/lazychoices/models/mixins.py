@@ -1,10 +1,45 @@
 from django.utils.encoding import force_text
 
-from lazychoices.utils import flatten_choices
+from lazychoices import stats
+from lazychoices.choices import get_choice_index
 
 
 class LazyChoiceModelMixin(object):
     def _get_LAZYFIELD_display(self, field):
-        choices = getattr(self, field.choices_name, [])
+        started = stats.start()
         value = getattr(self, field.attname)
-        return force_text(dict(flatten_choices(choices)).get(value, value), strings_only=True)
+        label = get_choice_index(self, field.choices_name).get_label(value, value)
+        stats.record('display', type(self), field.choices_name, started)
+        return force_text(label, strings_only=True)
+
+
+def resolve_displays(instances, field_name, discriminator=None, subclasses=None):
+    """
+    Yield an ``(instance, label)`` pair for each of the given instances, with
+    the display label of their lazy choice field ``field_name``, as
+    ``get_FOO_display()`` would return it.
+
+    The choices are resolved once per class instead of once per instance,
+    and ``instances`` may be any iterable (e.g. ``queryset.iterator()``); it
+    is consumed lazily, in order. To use the choices of proxy subclasses for
+    instances of their concrete model, pass the name of the
+    ``discriminator`` field and a ``subclasses`` mapping of its values to
+    models, as with ``display_case()``.
+    """
+    resolved = {}
+    for instance in instances:
+        started = stats.start()
+        klass = type(instance)
+        if discriminator is not None:
+            klass = subclasses.get(getattr(instance, discriminator), klass)
+        try:
+            attname, choices_name, index = resolved[klass]
+        except KeyError:
+            field = klass._meta.get_field(field_name)
+            attname, choices_name = field.attname, field.choices_name
+            index = get_choice_index(klass, choices_name)
+            resolved[klass] = attname, choices_name, index
+        value = getattr(instance, attname)
+        label = force_text(index.get_label(value, value), strings_only=True)
+        stats.record('display', klass, choices_name, started)
+        yield instance, label
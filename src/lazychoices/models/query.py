@@ -0,0 +1,202 @@
+from operator import itemgetter
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Case, CharField, F, Q, QuerySet, Value, When
+from django.utils import six
+from django.utils.encoding import force_text
+from django.utils.translation import get_language
+
+from lazychoices.choices import get_choice_index
+
+from .fields import LazyChoiceField
+
+
+def _label_case(index, attname, default):
+    whens = [
+        When(then=Value(force_text(index.labels[key])), **{attname: key})
+        for key, position in sorted(index.order.items(), key=itemgetter(1))
+    ]
+    return Case(*whens, default=default, output_field=CharField())
+
+
+def _unique(names):
+    seen = set()
+    return [name for name in names if not (name in seen or seen.add(name))]
+
+
+def _get_keyset_term(opts, term):
+    # Return the (attname, descending) pair of an ordering term, or None if
+    # it can't be part of a keyset.
+    if not isinstance(term, six.string_types):
+        return None
+    name = term.lstrip('-')
+    try:
+        field = opts.pk if name == 'pk' else opts.get_field(name)
+    except FieldDoesNotExist:
+        return None
+    if field.is_relation or field.null or not field.concrete:
+        # Foreign keys are ordered by the related model, and NULLs can't be
+        # compared.
+        return None
+    return field.attname, term.startswith('-')
+
+
+def _get_keyset_filter(keyset, row):
+    # Match the rows that come after ``row`` in the ordering of the keyset,
+    # i.e. (a > x) OR (a = x AND b > y) OR ...
+    condition = None
+    equal = {}
+    for name, descending in keyset:
+        lookup = '{0}__{1}'.format(name, 'lt' if descending else 'gt')
+        term = Q(**dict(equal, **{lookup: row[name]}))
+        condition = term if condition is None else condition | term
+        equal[name] = row[name]
+    return condition
+
+
+def _get_display_map(model, choices_name):
+    # The text labels of each key, shared for as long as the choices and the
+    # language don't change.
+    index = get_choice_index(model, choices_name)
+    return index.memoize(
+        ('display', get_language()),
+        lambda: dict((key, force_text(label, strings_only=True)) for key, label in index.labels.items()),
+    )
+
+
+def display_case(model, field_name, discriminator=None, subclasses=None):
+    """
+    Return a ``Case`` expression that evaluates to the display label of the
+    lazy choice field ``field_name`` on ``model``, so that labels can be
+    annotated, ordered and filtered on in the database.
+
+    Values without a label evaluate to the value itself, as with
+    ``get_FOO_display()``. To use the choices of proxy subclasses, pass the
+    name of the ``discriminator`` field and a ``subclasses`` mapping of its
+    values to models; other rows use the choices of ``model``.
+    """
+    field = model._meta.get_field(field_name)
+    default = _label_case(get_choice_index(model, field.choices_name), field.attname, F(field.attname))
+    if discriminator is None:
+        return default
+
+    whens = [
+        When(then=_label_case(get_choice_index(subclass, field.choices_name), field.attname, default),
+             **{discriminator: value})
+        for value, subclass in sorted(subclasses.items(), key=itemgetter(0))
+    ]
+    return Case(*whens, default=default, output_field=CharField())
+
+
+class LazyChoiceQuerySet(QuerySet):
+    def annotate_display(self, field_name, alias=None, discriminator=None, subclasses=None):
+        """
+        Annotate each row with the display label of the lazy choice field
+        ``field_name``, as ``<field_name>_display`` unless ``alias`` is given.
+        """
+        alias = alias or '{0}_display'.format(field_name)
+        expression = display_case(self.model, field_name, discriminator, subclasses)
+        return self.annotate(**{alias: expression})
+
+    def values_with_display(self, *fields, **kwargs):
+        """
+        Stream the ``values()`` of ``fields`` (all the concrete fields if none
+        are given) as dicts, with the display label of each lazy choice field
+        among them added as ``<field_name>_display``, without instantiating
+        any models.
+
+        The rows are read ``chunk_size`` at a time, so that memory use stays
+        constant on every database backend, in the order of the queryset with
+        the primary key as a tie-breaker. Each chunk starts after the last
+        row of the previous one if the queryset is only ordered by non-null
+        columns of the model, otherwise at an offset. A sliced queryset is
+        read in one go, and a randomly ordered one raises ``TypeError``.
+        ``discriminator`` and ``subclasses`` select the choices of proxy
+        subclasses, as with ``display_case()``.
+        """
+        chunk_size = kwargs.pop('chunk_size', 2000)
+        discriminator = kwargs.pop('discriminator', None)
+        subclasses = kwargs.pop('subclasses', None) or {}
+        if kwargs:
+            raise TypeError("values_with_display() got an unexpected keyword argument '{0}'".format(list(kwargs)[0]))
+
+        opts = self.model._meta
+        fields = list(fields) or [field.attname for field in opts.concrete_fields]
+        lazy_fields = [
+            field for field in opts.fields
+            if isinstance(field, LazyChoiceField) and field.attname in fields
+        ]
+        if not self.query.can_filter():
+            # A sliced queryset can't be read in further chunks.
+            ordering, keyset = None, ()
+        else:
+            ordering, keyset = self._get_chunk_ordering()
+        extra = ['pk', discriminator] + [name for name, descending in keyset or ()]
+        names = fields + [name for name in _unique(extra) if name is not None and name not in fields]
+
+        if ordering is None:
+            chunks = [self.values(*names).iterator()]
+        else:
+            chunks = self._iter_chunks(self.order_by(*ordering).values(*names), chunk_size, keyset)
+
+        display_maps = {}
+        for chunk in chunks:
+            for row in chunk:
+                klass = self.model
+                if discriminator is not None:
+                    klass = subclasses.get(row[discriminator], klass)
+                for field in lazy_fields:
+                    key = (klass, field.choices_name)
+                    display_map = display_maps.get(key)
+                    if display_map is None:
+                        display_map = display_maps[key] = _get_display_map(klass, field.choices_name)
+                    value = row[field.attname]
+                    row['{0}_display'.format(field.name)] = display_map.get(value, value)
+                for name in names[len(fields):]:
+                    del row[name]
+                yield row
+
+    def _get_chunk_ordering(self):
+        # Return the ordering of the queryset followed by the primary key, so
+        # that it's total, and the (attname, descending) pairs to paginate it
+        # on, or None if a term isn't a non-null column of the model.
+        query = self.query
+        opts = self.model._meta
+        if query.extra_order_by:
+            ordering = list(query.extra_order_by)
+        elif query.order_by:
+            ordering = list(query.order_by)
+        elif query.default_ordering:
+            ordering = list(opts.ordering)
+        else:
+            ordering = []
+        if '?' in ordering:
+            raise TypeError("values_with_display() can't read a randomly ordered queryset in chunks; slice it.")
+
+        keyset = [_get_keyset_term(opts, term) for term in ordering]
+        if None in keyset:
+            keyset = None
+        if keyset is None or opts.pk.attname not in [name for name, descending in keyset]:
+            ordering.append('pk')
+            if keyset is not None:
+                keyset.append((opts.pk.attname, False))
+        return ordering, keyset
+
+    def _iter_chunks(self, queryset, chunk_size, keyset):
+        offset = 0
+        after = None
+        while True:
+            if keyset is None:
+                chunk = list(queryset[offset:offset + chunk_size])
+                offset += len(chunk)
+            else:
+                chunk = list((queryset if after is None else queryset.filter(after))[:chunk_size])
+            if not chunk:
+                return
+            if keyset is not None:
+                # The keyset columns may be removed from the rows once they're
+                # yielded.
+                after = _get_keyset_filter(keyset, chunk[-1])
+            yield chunk
+            if len(chunk) < chunk_size:
+                return
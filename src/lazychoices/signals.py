@@ -0,0 +1,21 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal
+
+choices_invalidated = Signal(providing_args=['field'])
+stats_recorded = Signal(providing_args=['event', 'choices_name', 'elapsed'])
+
+
+def invalidate_on_change(source, model, field=None):
+    """
+    Invalidate the choices of ``model`` (see ``lazychoices.invalidate()``)
+    whenever an instance of the ``source`` model is saved or deleted, e.g.
+    when the choices are loaded from the ``source`` table.
+    """
+    from lazychoices.choices import invalidate
+
+    def receiver(sender, **kwargs):
+        invalidate(model, field)
+
+    post_save.connect(receiver, sender=source, weak=False)
+    post_delete.connect(receiver, sender=source, weak=False)
+    return receiver
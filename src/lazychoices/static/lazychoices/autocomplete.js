@@ -0,0 +1,111 @@
+/* Searches the choices of LazyChoiceAutocomplete widgets as the user types. */
+(function() {
+    'use strict';
+
+    var DELAY = 250;
+
+    function Autocomplete(select) {
+        this.select = select;
+        this.url = select.getAttribute('data-lazychoices-url');
+        this.term = '';
+        this.page = 1;
+        this.timeout = null;
+        this.request = null;
+
+        this.input = document.createElement('input');
+        this.input.type = 'search';
+        this.input.className = 'lazychoices-autocomplete vTextField';
+        this.input.setAttribute('autocomplete', 'off');
+        this.input.setAttribute('placeholder', 'Search…');
+        select.parentNode.insertBefore(this.input, select);
+
+        // A single select doesn't scroll, so the next page of results is
+        // loaded with an explicit button.
+        this.button = document.createElement('button');
+        this.button.type = 'button';
+        this.button.className = 'lazychoices-more button';
+        this.button.textContent = 'More results';
+        this.button.style.display = 'none';
+        select.parentNode.insertBefore(this.button, select.nextSibling);
+
+        this.input.addEventListener('input', this.schedule.bind(this));
+        this.button.addEventListener('click', this.loadMore.bind(this));
+    }
+
+    Autocomplete.prototype.schedule = function() {
+        clearTimeout(this.timeout);
+        this.timeout = setTimeout(this.search.bind(this, this.input.value, 1), DELAY);
+    };
+
+    Autocomplete.prototype.loadMore = function() {
+        if (this.more && !this.request) {
+            this.search(this.term, this.page + 1);
+        }
+    };
+
+    Autocomplete.prototype.search = function(term, page) {
+        var self = this;
+        var query = 'term=' + encodeURIComponent(term) + '&page=' + page;
+        var request = new XMLHttpRequest();
+        if (this.request) {
+            this.request.abort();
+        }
+        this.request = request;
+        request.open('GET', this.url + (this.url.indexOf('?') === -1 ? '?' : '&') + query);
+        request.setRequestHeader('X-Requested-With', 'XMLHttpRequest');
+        request.onload = function() {
+            self.request = null;
+            if (request.status === 200) {
+                self.term = term;
+                self.page = page;
+                self.update(JSON.parse(request.responseText), page > 1);
+            }
+        };
+        request.send();
+    };
+
+    Autocomplete.prototype.update = function(data, append) {
+        var select = this.select;
+        var keep = {};
+        var i, option;
+
+        // Keep the empty and selected options, and replace the others.
+        for (i = select.options.length - 1; i >= 0; i--) {
+            option = select.options[i];
+            if (option.value === '' || option.selected) {
+                keep[option.value] = true;
+            } else if (!append) {
+                select.remove(i);
+            } else {
+                keep[option.value] = true;
+            }
+        }
+        for (i = 0; i < data.results.length; i++) {
+            if (!keep[data.results[i].id]) {
+                select.add(new Option(data.results[i].text, data.results[i].id));
+            }
+        }
+        this.more = data.more;
+        this.button.style.display = this.more ? '' : 'none';
+    };
+
+    function init(root) {
+        var selects = root.querySelectorAll('select[data-lazychoices-url]');
+        for (var i = 0; i < selects.length; i++) {
+            if (!selects[i].lazychoicesAutocomplete && selects[i].name.indexOf('__prefix__') === -1) {
+                selects[i].lazychoicesAutocomplete = new Autocomplete(selects[i]);
+            }
+        }
+    }
+
+    document.addEventListener('DOMContentLoaded', function() {
+        init(document);
+    });
+
+    // Inline forms that are added to the page.
+    if (window.django && window.django.jQuery) {
+        window.django.jQuery(document).on('formset:added', function(event, row) {
+            init(row[0] || row);
+        });
+    }
+})();
@@ -0,0 +1,87 @@
+"""
+Opt-in instrumentation of choice resolution and of the caches built on it.
+
+Nothing is recorded until ``enable()`` is called. From then on every event
+is counted and timed (where it makes sense) per event name, and sent as the
+``lazychoices.signals.stats_recorded`` signal so that it can be fed into a
+metrics pipeline. The events are:
+
+* ``lookup``: the compiled choices of a class were looked up, followed by
+  one of ``lookup.hit``, ``lookup.miss`` (they were compiled for the first
+  time) or ``lookup.rebuild`` (they were compiled again because they were
+  reassigned, expired or invalidated).
+* ``provider.hit`` and ``provider.miss``: provided choices were found in,
+  or loaded and stored into, the provider's cache.
+* ``memo.hit`` and ``memo.miss``: data derived from the choices (e.g. form
+  choices or filter query strings) was reused or computed.
+* ``render.hit`` and ``render.miss``: rendered options were reused or
+  rendered by ``LazyChoiceSelect``.
+* ``counts.hit``, ``counts.miss``, ``values.hit`` and ``values.miss``: the
+  cached counts and present values of the admin list filters.
+* ``validate`` and ``display``: a value was validated or displayed.
+"""
+import threading
+import timeit
+
+from lazychoices.signals import stats_recorded
+
+_enabled = False
+_lock = threading.Lock()
+_stats = {}
+
+
+def enable():
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def is_enabled():
+    return _enabled
+
+
+def start():
+    """
+    Return the time to pass to ``record()`` to time an event, or None if the
+    instrumentation is disabled.
+    """
+    if _enabled:
+        return timeit.default_timer()
+    return None
+
+
+def record(event, sender=None, choices_name=None, started=None):
+    """
+    Count an ``event`` for the ``choices_name`` of the ``sender`` class and,
+    if ``started`` is given, add the time since then to its timer.
+    """
+    if not _enabled:
+        return
+
+    elapsed = None if started is None else timeit.default_timer() - started
+    with _lock:
+        stat = _stats.get(event)
+        if stat is None:
+            stat = _stats[event] = {'count': 0, 'time': 0.0}
+        stat['count'] += 1
+        if elapsed is not None:
+            stat['time'] += elapsed
+    stats_recorded.send(sender=sender, event=event, choices_name=choices_name, elapsed=elapsed)
+
+
+def get_stats():
+    """
+    Return a dict mapping each recorded event to its ``count`` and the total
+    ``time`` spent on it in seconds.
+    """
+    with _lock:
+        return dict((event, dict(stat)) for event, stat in _stats.items())
+
+
+def reset():
+    with _lock:
+        _stats.clear()
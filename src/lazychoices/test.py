@@ -0,0 +1,77 @@
+from lazychoices import stats
+from lazychoices.signals import stats_recorded
+
+
+class CaptureChoiceEvents(object):
+    """
+    Context manager that enables the instrumentation (see
+    ``lazychoices.stats``) and captures the events recorded in its block.
+    """
+
+    def __init__(self):
+        self.captured_events = []
+
+    def __enter__(self):
+        self.was_enabled = stats.is_enabled()
+        stats.enable()
+        stats_recorded.connect(self.receiver)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        stats_recorded.disconnect(self.receiver)
+        if not self.was_enabled:
+            stats.disable()
+
+    def receiver(self, sender, event, choices_name, **kwargs):
+        self.captured_events.append((event, sender, choices_name))
+
+    def count(self, event):
+        return sum(1 for captured in self.captured_events if captured[0] == event)
+
+
+class _AssertMaxChoiceResolutionsContext(CaptureChoiceEvents):
+    def __init__(self, test_case, num, event):
+        self.test_case = test_case
+        self.num = num
+        self.event = event
+        super(_AssertMaxChoiceResolutionsContext, self).__init__()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        super(_AssertMaxChoiceResolutionsContext, self).__exit__(exc_type, exc_value, traceback)
+        if exc_type is not None:
+            return
+
+        executed = self.count(self.event)
+        self.test_case.assertTrue(
+            executed <= self.num,
+            '{0} choice resolutions ({1!r} events) performed, {2} or less expected.\n'
+            'Captured events were:\n{3}'.format(
+                executed, self.event, self.num,
+                '\n'.join('{0} {1} {2}'.format(*captured) for captured in self.captured_events),
+            ),
+        )
+
+
+class LazyChoicesTestMixin(object):
+    """
+    A mixin for ``TestCase`` that adds ``assertMaxChoiceResolutions()``.
+    """
+
+    def assertMaxChoiceResolutions(self, num, func=None, *args, **kwargs):
+        """
+        Assert that at most ``num`` choices are resolved (i.e. looked up with
+        ``get_choice_index()``) while calling ``func`` or, if it's omitted, in
+        the block of the returned context manager, e.g.::
+
+            with self.assertMaxChoiceResolutions(2):
+                self.client.get('/books/')
+
+        Another event of ``lazychoices.stats`` can be counted instead with the
+        ``event`` keyword argument, e.g. ``'lookup.rebuild'``.
+        """
+        context = _AssertMaxChoiceResolutionsContext(self, num, kwargs.pop('event', 'lookup'))
+        if func is None:
+            return context
+
+        with context:
+            func(*args, **kwargs)
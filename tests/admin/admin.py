@@ -1,6 +1,12 @@
-from django.contrib.admin import ModelAdmin
+from django.contrib.admin import AdminSite, ModelAdmin, TabularInline
 
-from lazychoices.admin import LazyChoicesFieldListFilter
+from lazychoices.admin import (
+    LazyChoiceInlineModelAdminMixin, LazyChoiceModelAdminMixin, LazyChoicesFieldListFilter,
+    LazyChoicesOnlyFieldListFilter, export_as_csv, export_as_json_lines,
+)
+from lazychoices.forms import LazyChoiceModelForm
+
+from .models import Book, Review
 
 
 class BookAdmin(ModelAdmin):
@@ -9,3 +15,59 @@ class BookAdmin(ModelAdmin):
         ('genre', LazyChoicesFieldListFilter),
     ]
     ordering = ['-id']
+
+
+class CountingLazyChoicesFieldListFilter(LazyChoicesFieldListFilter):
+    show_counts = True
+    counts_cache_timeout = 60
+
+
+class BookCountAdmin(ModelAdmin):
+    list_filter = [
+        ('category', CountingLazyChoicesFieldListFilter),
+        ('genre', CountingLazyChoicesFieldListFilter),
+    ]
+    ordering = ['-id']
+
+
+class BookOnlyAdmin(ModelAdmin):
+    list_filter = [
+        ('category', LazyChoicesOnlyFieldListFilter),
+        ('genre', LazyChoicesOnlyFieldListFilter),
+    ]
+    ordering = ['-id']
+
+
+class FictionOnlyAdmin(BookOnlyAdmin):
+    def get_queryset(self, request):
+        return super(FictionOnlyAdmin, self).get_queryset(request).filter(category='fiction')
+
+
+class BookDisplayAdmin(LazyChoiceModelAdminMixin, ModelAdmin):
+    list_display = ['title', 'category', 'genre']
+    list_display_links = ['title', 'genre']
+    ordering = ['id']
+
+
+class ReviewAutocompleteInline(LazyChoiceInlineModelAdminMixin, TabularInline):
+    form = LazyChoiceModelForm
+    lazy_autocomplete_fields = ['genre']
+    lazy_model = Book
+    model = Review
+
+
+class BookAutocompleteAdmin(LazyChoiceModelAdminMixin, ModelAdmin):
+    inlines = [ReviewAutocompleteInline]
+    lazy_autocomplete_fields = ['genre']
+    lazy_autocomplete_page_size = 2
+
+
+site = AdminSite()
+site.register(Book, BookAutocompleteAdmin)
+
+
+class BookExportAdmin(LazyChoiceModelAdminMixin, ModelAdmin):
+    actions = [export_as_csv, export_as_json_lines]
+    lazy_export_chunk_size = 2
+    lazy_export_fields = ['title', 'genre']
+    list_filter = [('genre', LazyChoicesFieldListFilter)]
@@ -18,3 +18,9 @@ class Book(LazyChoiceModelMixin, models.Model):
 class Chapter(models.Model):
     book = models.ForeignKey(Book, on_delete=models.CASCADE)
     name = models.CharField(max_length=40)
+
+
+class Review(LazyChoiceModelMixin, models.Model):
+    book = models.ForeignKey(Book, on_delete=models.CASCADE)
+    name = models.CharField(max_length=40)
+    genre = LazyChoiceField(null=True, blank=True)
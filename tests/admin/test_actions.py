@@ -0,0 +1,105 @@
+import json
+
+from django.contrib.admin import ModelAdmin, site
+from django.contrib.admin.views.main import ChangeList
+from django.test import RequestFactory, TestCase
+
+from lazychoices.admin import export_as_csv, export_as_json_lines
+
+from .admin import BookExportAdmin
+from .models import Book
+
+
+class ExportActionTests(TestCase):
+    def setUp(self):
+        self.modeladmin = BookExportAdmin(Book, site)
+        self.request_factory = RequestFactory()
+
+        self.crime_book = Book.objects.create(title='Sherlock Holmes', category='fiction', genre='crime')
+        self.horror_book = Book.objects.create(title='The Shining', category='fiction', genre='horror')
+        self.reference_book = Book.objects.create(
+            title='Encyclopedia, 2nd "ed."', category='non-fiction', genre='reference',
+        )
+        self.unwritten_book = Book.objects.create(title='The Unwritten Book', category='other', genre=None)
+
+    def get_queryset(self, params):
+        request = self.request_factory.get('/', params)
+        changelist = ChangeList(
+            request, Book, self.modeladmin.list_display,
+            self.modeladmin.list_display_links, self.modeladmin.list_filter,
+            self.modeladmin.date_hierarchy, self.modeladmin.search_fields,
+            self.modeladmin.list_select_related, self.modeladmin.list_per_page,
+            self.modeladmin.list_max_show_all, self.modeladmin.list_editable, self.modeladmin,
+        )
+        return request, changelist.get_queryset(request)
+
+    def get_content(self, response):
+        return b''.join(response.streaming_content).decode('utf-8')
+
+    def test_export_as_csv(self):
+        request, queryset = self.get_queryset({})
+        response = export_as_csv(self.modeladmin, request, queryset)
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="book.csv"')
+        self.assertEqual(self.get_content(response).splitlines(), [
+            'title,genre,genre_display',
+            'The Unwritten Book,,',
+            '"Encyclopedia, 2nd ""ed.""",reference,Reference',
+            'The Shining,horror,Horror',
+            'Sherlock Holmes,crime,Crime',
+        ])
+
+    def test_export_ordered(self):
+        # The rows are exported in the order of the changelist.
+        request, queryset = self.get_queryset({})
+        response = export_as_csv(self.modeladmin, request, queryset.order_by('title'))
+        self.assertEqual(self.get_content(response).splitlines()[1:], [
+            '"Encyclopedia, 2nd ""ed.""",reference,Reference',
+            'Sherlock Holmes,crime,Crime',
+            'The Shining,horror,Horror',
+            'The Unwritten Book,,',
+        ])
+
+    def test_export_filtered(self):
+        request, queryset = self.get_queryset({'genre__exact': 'horror'})
+        response = export_as_csv(self.modeladmin, request, queryset)
+        self.assertEqual(self.get_content(response).splitlines(), [
+            'title,genre,genre_display',
+            'The Shining,horror,Horror',
+        ])
+
+    def test_export_as_json_lines(self):
+        request, queryset = self.get_queryset({'genre__isnull': 'True'})
+        response = export_as_json_lines(self.modeladmin, request, queryset)
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="book.jsonl"')
+        self.assertEqual(
+            [json.loads(line) for line in self.get_content(response).splitlines()],
+            [{'title': 'The Unwritten Book', 'genre': None, 'genre_display': None}],
+        )
+
+    def test_streams_chunks(self):
+        request, queryset = self.get_queryset({})
+        response = export_as_json_lines(self.modeladmin, request, queryset)
+        with self.assertNumQueries(1):
+            next(iter(response.streaming_content))
+        with self.assertNumQueries(2):
+            self.assertEqual(len(list(response.streaming_content)), 3)
+
+    def test_plain_model_admin(self):
+        modeladmin = ModelAdmin(Book, site)
+        request = self.request_factory.get('/')
+        response = export_as_json_lines(modeladmin, request, Book.objects.filter(pk=self.crime_book.pk))
+        self.assertEqual(json.loads(self.get_content(response)), {
+            'id': self.crime_book.pk,
+            'title': 'Sherlock Holmes',
+            'category': 'fiction',
+            'category_display': 'Fiction',
+            'genre': 'crime',
+            'genre_display': 'Crime',
+        })
+
+    def test_short_description(self):
+        self.assertEqual(
+            export_as_csv.short_description % {'verbose_name_plural': 'books'},
+            'Export selected books as CSV',
+        )
@@ -1,9 +1,10 @@
 from django.contrib.admin import site
 from django.contrib.admin.views.main import ChangeList
+from django.core.cache import cache
 from django.test import RequestFactory, TestCase
 from django.utils.encoding import force_text
 
-from .admin import BookAdmin
+from .admin import BookAdmin, BookCountAdmin, BookOnlyAdmin, FictionOnlyAdmin
 from .models import Book
 
 
@@ -77,3 +78,98 @@ class LazyChoicesFieldListFilterTests(TestCase):
         self.assertEqual(choices[1]['display'], 'Crime')
         self.assertEqual(choices[1]['selected'], True)
         self.assertEqual(choices[1]['query_string'], '?genre__exact=crime')
+
+    def test_query_strings(self):
+        request = self.request_factory.get('/', {
+            'category__exact': 'fiction', 'genre__isnull': 'True', 'o': '1', 'q': 'a b',
+        })
+        changelist = self.get_changelist(request, Book, self.modeladmin)
+
+        for filterspec in changelist.get_filters(request)[0]:
+            choices = list(filterspec.choices(changelist))[1:len(filterspec.lookup_choices) + 1]
+            self.assertEqual(
+                [choice['query_string'] for choice in choices],
+                [changelist.get_query_string({filterspec.lookup_kwarg: lookup}, [filterspec.lookup_kwarg_isnull])
+                 for lookup, title in filterspec.lookup_choices],
+            )
+
+    def test_lookup_fragments_are_shared(self):
+        request = self.request_factory.get('/', {})
+        filterspec1 = self.get_changelist(request, Book, self.modeladmin).get_filters(request)[0][0]
+        filterspec2 = self.get_changelist(request, Book, self.modeladmin).get_filters(request)[0][0]
+        self.assertIs(filterspec1.get_lookup_fragments(), filterspec2.get_lookup_fragments())
+        self.assertEqual(
+            filterspec1.get_lookup_fragments()['non-fiction'],
+            ('non-fiction', 'category__exact=non-fiction'),
+        )
+
+    def test_counts(self):
+        modeladmin = BookCountAdmin(Book, site)
+        request = self.request_factory.get('/', {'category__exact': 'fiction'})
+        changelist = self.get_changelist(request, Book, modeladmin)
+
+        filterspec = changelist.get_filters(request)[0][1]
+        self.assertEqual(
+            [choice['display'] for choice in filterspec.choices(changelist)],
+            ['All (3)', 'Crime (2)', 'Horror (1)', 'Biography (0)', 'Reference (0)',
+             '{0} (0)'.format(filterspec.empty_value_display)],
+        )
+
+    def test_counts_are_cached(self):
+        cache.clear()
+        modeladmin = BookCountAdmin(Book, site)
+        request = self.request_factory.get('/', {})
+        changelist = self.get_changelist(request, Book, modeladmin)
+        filterspec = changelist.get_filters(request)[0][0]
+
+        with self.assertNumQueries(1):
+            choices = list(filterspec.choices(changelist))
+        self.assertEqual(
+            [choice['display'] for choice in choices],
+            ['All (6)', 'Fiction (3)', 'Non-Fiction (2)', 'Other (1)'],
+        )
+
+        Book.objects.create(title='Dracula', category='fiction', genre='horror')
+        with self.assertNumQueries(0):
+            choices = list(filterspec.choices(changelist))
+        self.assertEqual(choices[1]['display'], 'Fiction (3)')
+
+    def test_only_present_values(self):
+        cache.clear()
+        self.horror_book.delete()
+        modeladmin = BookOnlyAdmin(Book, site)
+        request = self.request_factory.get('/', {})
+
+        # One DISTINCT query per filter and one for the changelist count.
+        with self.assertNumQueries(3):
+            changelist = self.get_changelist(request, Book, modeladmin)
+        filterspec = changelist.get_filters(request)[0][1]
+        self.assertEqual(
+            [choice['display'] for choice in filterspec.choices(changelist)],
+            ['All', 'Crime', 'Biography', 'Reference', filterspec.empty_value_display],
+        )
+
+        # The present values are cached.
+        Book.objects.create(title='Dracula', category='fiction', genre='horror')
+        with self.assertNumQueries(0):
+            filterspec = changelist.get_filters(request)[0][1]
+        self.assertEqual(len(list(filterspec.choices(changelist))), 5)
+
+    def test_only_present_values_of_admin_queryset(self):
+        cache.clear()
+        request = self.request_factory.get('/', {})
+        self.get_changelist(request, Book, BookOnlyAdmin(Book, site))
+
+        # Only the rows of the admin's queryset count, and they aren't mixed
+        # up with the cached values of another admin.
+        modeladmin = FictionOnlyAdmin(Book, site)
+        changelist = self.get_changelist(request, Book, modeladmin)
+        filterspecs = changelist.get_filters(request)[0]
+        self.assertEqual(
+            [choice['display'] for choice in filterspecs[0].choices(changelist)],
+            ['All', 'Fiction'],
+        )
+        self.assertEqual(
+            [choice['display'] for choice in filterspecs[1].choices(changelist)],
+            ['All', 'Crime', 'Horror', filterspecs[1].empty_value_display],
+        )
@@ -1,10 +1,17 @@
+import json
+
 from django.contrib import admin
 from django.contrib.auth.models import User
-from django.test import RequestFactory, TestCase
+from django.core.exceptions import PermissionDenied
+from django.core.urlresolvers import reverse
+from django.http import Http404
+from django.test import RequestFactory, TestCase, override_settings
 
 from lazychoices.admin import LazyChoiceInlineModelAdminMixin
+from lazychoices.forms import LazyChoiceAutocomplete, LazyChoiceModelForm
 
-from .models import Book, Chapter
+from .admin import BookDisplayAdmin, site
+from .models import Book, Chapter, Review
 
 
 class LazyChoiceInlineModelAdminMixinTests(TestCase):
@@ -22,3 +29,185 @@ class LazyChoiceInlineModelAdminMixinTests(TestCase):
 
         formset = inline.get_formset(request)
         self.assertEqual(formset.lazy_model, Book)
+
+    def test_large_formset(self):
+        class InlineModelAdmin(LazyChoiceInlineModelAdminMixin, admin.options.InlineModelAdmin):
+            extra = 0
+            form = LazyChoiceModelForm
+            lazy_model = Book
+            max_num = 1000
+            model = Review
+
+        inline = InlineModelAdmin(Book, admin.site)
+        request = self.request_factory.get('/')
+        request.user = User.objects.create_superuser('example', 'example@example.com', 'password')
+        book = Book.objects.create(title='Encyclopedia', category='non-fiction', genre='reference')
+
+        data = {
+            'review_set-TOTAL_FORMS': '500',
+            'review_set-INITIAL_FORMS': '0',
+            'review_set-MAX_NUM_FORMS': '1000',
+        }
+        for i in range(500):
+            data['review_set-{0}-name'.format(i)] = 'Review {0}'.format(i)
+            data['review_set-{0}-genre'.format(i)] = 'reference' if i % 2 else 'crime'
+
+        FormSet = inline.get_formset(request, book)
+        formset = FormSet(data, instance=book)
+        self.assertTrue(formset.is_valid())
+
+        # Every form shares the choices resolved from the lazy model.
+        choices = formset.forms[0].fields['genre'].choices
+        self.assertEqual(choices[1:], tuple(Book.GENRE_CHOICES))
+        for form in formset.forms + [formset.empty_form]:
+            self.assertEqual(form.lazy_model, Book)
+            self.assertIs(form.fields['genre'].choices, choices)
+
+        data['review_set-499-genre'] = 'invalid'
+        formset = FormSet(data, instance=book)
+        self.assertFalse(formset.is_valid())
+        self.assertEqual(list(formset.errors[499]), ['genre'])
+
+
+class LazyChoiceModelAdminMixinTests(TestCase):
+    def setUp(self):
+        self.modeladmin = BookDisplayAdmin(Book, admin.site)
+        self.request_factory = RequestFactory()
+
+        self.crime_book = Book.objects.create(title='Sherlock Holmes', category='fiction', genre='crime')
+        self.biography_book = Book.objects.create(title='A Child Called It', category='non-fiction', genre='biography')
+        self.reference_book = Book.objects.create(title='Encyclopedia', category='non-fiction', genre='reference')
+        self.horror_book = Book.objects.create(title='The Shining', category='fiction', genre='horror')
+
+    def get_changelist(self, request, model, modeladmin):
+        list_display = modeladmin.get_list_display(request)
+        return modeladmin.get_changelist(request)(
+            request, model, list_display,
+            modeladmin.get_list_display_links(request, list_display), modeladmin.list_filter,
+            modeladmin.date_hierarchy, modeladmin.search_fields,
+            modeladmin.list_select_related, modeladmin.list_per_page,
+            modeladmin.list_max_show_all, modeladmin.list_editable, modeladmin,
+        )
+
+    def test_list_display(self):
+        request = self.request_factory.get('/')
+        list_display = self.modeladmin.get_list_display(request)
+        self.assertEqual(list_display[0], 'title')
+        self.assertEqual(list_display[1].short_description, 'category')
+        self.assertEqual(list_display[1].admin_order_field, 'category_display')
+        self.assertEqual(list_display[2](self.crime_book), 'Crime')
+        self.assertIs(self.modeladmin.get_list_display(request)[2], list_display[2])
+        self.assertEqual(self.modeladmin.get_list_display_links(request, list_display), ['title', list_display[2]])
+
+    def test_ordering_by_label(self):
+        request = self.request_factory.get('/', {'o': '2'})
+        changelist = self.get_changelist(request, Book, self.modeladmin)
+        queryset = changelist.get_queryset(request)
+        self.assertEqual(
+            [book.genre_display for book in queryset],
+            ['Biography', 'Crime', 'Horror', 'Reference'],
+        )
+
+        request = self.request_factory.get('/', {'o': '-2'})
+        changelist = self.get_changelist(request, Book, self.modeladmin)
+        queryset = changelist.get_queryset(request)
+        self.assertEqual(list(queryset), [self.reference_book, self.horror_book, self.crime_book, self.biography_book])
+
+    def test_no_label_annotation_unless_ordered(self):
+        request = self.request_factory.get('/', {'o': '0'})
+        changelist = self.get_changelist(request, Book, self.modeladmin)
+        self.assertNotIn('CASE', str(changelist.get_queryset(request).query))
+        self.assertNotIn('CASE', str(self.modeladmin.get_queryset(request).query))
+        self.assertEqual(changelist.result_count, 4)
+
+        request = self.request_factory.get('/', {'o': '1'})
+        changelist = self.get_changelist(request, Book, self.modeladmin)
+        queryset = changelist.get_queryset(request)
+        self.assertIn('CASE', str(queryset.query))
+        self.assertEqual([book.category_display for book in queryset], [
+            'Fiction', 'Fiction', 'Non-Fiction', 'Non-Fiction',
+        ])
+
+    def test_list_editable(self):
+        class BookAdmin(BookDisplayAdmin):
+            list_display = ['title', 'category', 'genre']
+            list_editable = ['genre']
+
+        modeladmin = BookAdmin(Book, admin.site)
+        request = self.request_factory.get('/')
+        list_display = modeladmin.get_list_display(request)
+        self.assertEqual(list_display[2], 'genre')
+        self.assertEqual(list_display[1].admin_order_field, 'category_display')
+
+        changelist = self.get_changelist(request, Book, modeladmin)
+        FormSet = modeladmin.get_changelist_formset(request)
+        formset = FormSet(queryset=changelist.result_list)
+        self.assertIn('genre', formset.forms[0].fields)
+        self.assertIn('genre', changelist.list_display)
+
+
+@override_settings(ROOT_URLCONF='tests.admin.urls')
+class LazyChoiceAutocompleteTests(TestCase):
+    def setUp(self):
+        self.modeladmin = site._registry[Book]
+        self.request_factory = RequestFactory()
+        self.user = User.objects.create_superuser('example', 'example@example.com', 'password')
+
+    def search(self, model_name, field_name, **params):
+        request = self.request_factory.get('/', params)
+        request.user = self.user
+        response = self.modeladmin.lazy_autocomplete_view(request, 'admin', model_name, field_name)
+        return json.loads(response.content.decode('utf-8'))
+
+    def test_search(self):
+        self.assertEqual(self.search('book', 'genre', term='E'), {
+            'results': [{'id': 'crime', 'text': 'Crime'}, {'id': 'reference', 'text': 'Reference'}],
+            'more': False,
+        })
+        self.assertEqual(self.search('book', 'genre', term='r')['more'], True)
+        self.assertEqual(self.search('book', 'genre', term='r', page='2'), {
+            'results': [{'id': 'biography', 'text': 'Biography'}, {'id': 'reference', 'text': 'Reference'}],
+            'more': False,
+        })
+        self.assertEqual(len(self.search('book', 'genre', page='invalid')['results']), 2)
+
+    def test_search_inline(self):
+        self.assertEqual(
+            self.search('review', 'genre', term='bio')['results'],
+            [{'id': 'biography', 'text': 'Biography'}],
+        )
+
+    def test_search_unknown_field(self):
+        with self.assertRaises(Http404):
+            self.search('book', 'category')
+        with self.assertRaises(Http404):
+            self.search('chapter', 'genre')
+
+    def test_search_without_permission(self):
+        self.user = User.objects.create_user('other', 'other@example.com', 'password')
+        with self.assertRaises(PermissionDenied):
+            self.search('book', 'genre')
+
+    def test_widget(self):
+        request = self.request_factory.get('/')
+        request.user = self.user
+        form = self.modeladmin.get_form(request)()
+        widget = form.fields['genre'].widget
+        self.assertIsInstance(widget, LazyChoiceAutocomplete)
+        self.assertIn('lazychoices/autocomplete.js', str(form.media))
+
+        url = reverse('admin:admin_book_lazychoices', kwargs={
+            'app_label': 'admin', 'model_name': 'book', 'field_name': 'genre',
+        })
+        self.assertHTMLEqual(
+            widget.render('genre', 'horror'),
+            '<select name="genre" data-lazychoices-url="{0}">'
+            '<option value="">---------</option>'
+            '<option value="horror" selected="selected">Horror</option>'
+            '</select>'.format(url),
+        )
+        self.assertNotIsInstance(form.fields['category'].widget, LazyChoiceAutocomplete)
+
+        inline = self.modeladmin.get_inline_instances(request)[0]
+        formset = inline.get_formset(request)()
+        self.assertIn('/admin/admin/book/lazychoices/admin/review/genre/', formset.empty_form['genre'].as_widget())
@@ -17,10 +17,22 @@ class LazyChoiceFieldTests(IsolatedModelsTestCase):
         f2 = copy.deepcopy(f1)
         self.assertIsNot(f1, f2)
         self.assertEqual(f1.choices, f2.choices)
-        self.assertIsNot(f1.choices, f2.choices)
+        self.assertIs(f1.choices, f2.choices)
         self.assertEqual(f1.model, f2.model)
         self.assertIs(f1.model, f2.model)
 
+    def test_choices_are_shared(self):
+        class Model(models.Model):
+            FIELD_CHOICES = [('foo', 'Foo'), ('bar', 'Bar')]
+
+        f1 = LazyChoiceField(model=Model, choices_name='FIELD_CHOICES')
+        f2 = LazyChoiceField(model=Model, choices_name='FIELD_CHOICES')
+        f3 = LazyChoiceField(model=Model, choices_name='FIELD_CHOICES', initial='foo')
+        self.assertIs(f1.choices, f2.choices)
+        self.assertIs(f1.widget.choices, f1.choices)
+        self.assertIsNot(f1.choices, f3.choices)
+        self.assertIsInstance(f1.choices, tuple)
+
     def test_required(self):
         class Model(models.Model):
             FIELD_CHOICES = [('foo', 'Foo'), ('bar', 'Bar')]
@@ -87,28 +99,28 @@ class LazyChoiceFieldTests(IsolatedModelsTestCase):
             FIELD_CHOICES = [('foo', 'Foo'), ('bar', 'Bar')]
 
         f = LazyChoiceField(model=Model, choices_name='FIELD_CHOICES')
-        self.assertEqual([('', '---------'), ('foo', 'Foo'), ('bar', 'Bar')], f.choices)
+        self.assertEqual((('', '---------'), ('foo', 'Foo'), ('bar', 'Bar')), f.choices)
 
     def test_choices_with_field_required_and_initial_value(self):
         class Model(models.Model):
             FIELD_CHOICES = [('foo', 'Foo'), ('bar', 'Bar')]
 
         f = LazyChoiceField(model=Model, choices_name='FIELD_CHOICES', initial='foo')
-        self.assertEqual([('foo', 'Foo'), ('bar', 'Bar')], f.choices)
+        self.assertEqual((('foo', 'Foo'), ('bar', 'Bar')), f.choices)
 
     def test_choices_with_field_not_required(self):
         class Model(models.Model):
             FIELD_CHOICES = [('foo', 'Foo'), ('bar', 'Bar')]
 
         f = LazyChoiceField(model=Model, choices_name='FIELD_CHOICES', required=False)
-        self.assertEqual([('', '---------'), ('foo', 'Foo'), ('bar', 'Bar')], f.choices)
+        self.assertEqual((('', '---------'), ('foo', 'Foo'), ('bar', 'Bar')), f.choices)
 
     def test_choices_with_field_not_required_and_initial_value(self):
         class Model(models.Model):
             FIELD_CHOICES = [('foo', 'Foo'), ('bar', 'Bar')]
 
         f = LazyChoiceField(model=Model, choices_name='FIELD_CHOICES', initial='foo', required=False)
-        self.assertEqual([('', '---------'), ('foo', 'Foo'), ('bar', 'Bar')], f.choices)
+        self.assertEqual((('', '---------'), ('foo', 'Foo'), ('bar', 'Bar')), f.choices)
 
     def test_set_model_changes_choices(self):
         class ModelA(models.Model):
@@ -118,7 +130,7 @@ class LazyChoiceFieldTests(IsolatedModelsTestCase):
             FIELD_CHOICES = [('baz', 'Baz'), ('qux', 'Qux')]
 
         f = LazyChoiceField(model=ModelA, choices_name='FIELD_CHOICES')
-        self.assertEqual([('', '---------'), ('foo', 'Foo'), ('bar', 'Bar')], f.choices)
+        self.assertEqual((('', '---------'), ('foo', 'Foo'), ('bar', 'Bar')), f.choices)
 
         f.model = ModelB
-        self.assertEqual([('', '---------'), ('baz', 'Baz'), ('qux', 'Qux')], f.choices)
+        self.assertEqual((('', '---------'), ('baz', 'Baz'), ('qux', 'Qux')), f.choices)
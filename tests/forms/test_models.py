@@ -1,8 +1,10 @@
 from django.db import models
-from django.forms import CharField, inlineformset_factory
+from django.forms import CharField, ChoiceField, inlineformset_factory
 
 from lazychoices import LazyChoiceField, LazyChoiceModelMixin
-from lazychoices.forms import LazyChoiceInlineFormSet, LazyChoiceModelForm
+from lazychoices.forms import (
+    LazyChoiceField as LazyChoiceFormField, LazyChoiceInlineFormSet, LazyChoiceModelForm,
+)
 
 from .base import IsolatedModelsTestCase
 from .models import Poem, Poet
@@ -36,6 +38,50 @@ class LazyChoiceInlineFormSetTests(IsolatedModelsTestCase):
         self.assertTrue(hasattr(formset.empty_form, 'lazy_model'))
         self.assertEqual(formset.empty_form.lazy_model, Poem)
 
+    def test_fields_added_in_init(self):
+        class ModelA(AbstractModel):
+            FIELD_CHOICES = [('foo', 'Foo'), ('bar', 'Bar')]
+
+        class ModelB(AbstractModel):
+            FIELD_CHOICES = [('baz', 'Baz'), ('qux', 'Qux')]
+
+        class PoemForm(LazyChoiceModelForm):
+            def __init__(self, *args, **kwargs):
+                super(PoemForm, self).__init__(*args, **kwargs)
+                self.fields['extra'] = LazyChoiceFormField(model=ModelA, choices_name='FIELD_CHOICES')
+
+        FormSet = inlineformset_factory(
+            Poet, Poem, form=PoemForm, fields='__all__', formset=LazyChoiceInlineFormSet, extra=1,
+        )
+        formset = FormSet()
+        formset.lazy_model = ModelB
+
+        for form in [formset.forms[0], formset.empty_form]:
+            self.assertEqual(form.fields['extra'].model, ModelB)
+            self.assertEqual(form.fields['extra'].choices, (('', '---------'), ('baz', 'Baz'), ('qux', 'Qux')))
+
+    def test_lazy_field_replaced_in_init(self):
+        class ModelB(AbstractModel):
+            FIELD_CHOICES = [('baz', 'Baz'), ('qux', 'Qux')]
+
+        class PoemForm(LazyChoiceModelForm):
+            other = LazyChoiceFormField(choices_name='FIELD_CHOICES')
+            genre = LazyChoiceFormField(choices_name='FIELD_CHOICES')
+
+            def __init__(self, *args, **kwargs):
+                super(PoemForm, self).__init__(*args, **kwargs)
+                self.fields['genre'] = ChoiceField(choices=[('foo', 'Foo')])
+
+        FormSet = inlineformset_factory(
+            Poet, Poem, form=PoemForm, fields='__all__', formset=LazyChoiceInlineFormSet, extra=1,
+        )
+        formset = FormSet()
+        formset.lazy_model = ModelB
+
+        for form in [formset.forms[0], formset.empty_form]:
+            self.assertEqual(form.fields['other'].model, ModelB)
+            self.assertEqual(form.fields['genre'].choices, [('foo', 'Foo')])
+
 
 class LazyChoiceModelFormTests(IsolatedModelsTestCase):
     def test_replace_model(self):
@@ -55,5 +101,71 @@ class LazyChoiceModelFormTests(IsolatedModelsTestCase):
         form = ModelForm(instance=ModelB())
         formfield = form.fields['field']
         self.assertEqual(form.lazy_model, ModelB)
-        self.assertEqual(formfield.choices, [('', '---------'), ('baz', 'Baz'), ('qux', 'Qux')])
+        self.assertEqual(formfield.choices, (('', '---------'), ('baz', 'Baz'), ('qux', 'Qux')))
+        self.assertEqual(formfield.model, ModelB)
+
+    def test_lazy_field_names(self):
+        class ModelA(AbstractModel):
+            FIELD_CHOICES = [('foo', 'Foo'), ('bar', 'Bar')]
+
+        class ModelForm(LazyChoiceModelForm):
+            custom = CharField()
+
+            class Meta:
+                fields = '__all__'
+                model = ModelA
+
+        class SubModelForm(ModelForm):
+            other = LazyChoiceFormField(choices_name='OTHER_CHOICES')
+
+        self.assertEqual(ModelForm._get_lazy_field_names(), ('field',))
+        self.assertEqual(sorted(SubModelForm._get_lazy_field_names()), ['field', 'other'])
+        self.assertEqual(ModelForm._get_lazy_field_names(), ('field',))
+
+    def test_set_same_model(self):
+        class ModelA(AbstractModel):
+            FIELD_CHOICES = [('foo', 'Foo'), ('bar', 'Bar')]
+
+        class ModelB(AbstractModel):
+            FIELD_CHOICES = [('baz', 'Baz'), ('qux', 'Qux')]
+
+        class ModelForm(LazyChoiceModelForm):
+            class Meta:
+                fields = '__all__'
+                model = ModelA
+
+        form = ModelForm(instance=ModelB())
+        formfield = form.fields['field']
         self.assertEqual(formfield.model, ModelB)
+
+        # Setting the same lazy model again doesn't touch the fields.
+        formfield.model = None
+        form.lazy_model = ModelB
+        self.assertEqual(formfield.model, None)
+
+        form.lazy_model = ModelA
+        self.assertEqual(formfield.model, ModelA)
+        self.assertEqual(formfield.choices, (('', '---------'), ('foo', 'Foo'), ('bar', 'Bar')))
+
+    def test_set_same_model_with_added_field(self):
+        class ModelA(AbstractModel):
+            FIELD_CHOICES = [('foo', 'Foo'), ('bar', 'Bar')]
+
+        class ModelB(AbstractModel):
+            FIELD_CHOICES = [('baz', 'Baz'), ('qux', 'Qux')]
+
+        class ModelForm(LazyChoiceModelForm):
+            class Meta:
+                fields = '__all__'
+                model = ModelA
+
+        form = ModelForm(instance=ModelB())
+        form.fields['other'] = LazyChoiceFormField(model=ModelA, choices_name='FIELD_CHOICES')
+        form.lazy_model = ModelB
+        self.assertEqual(form.fields['other'].model, ModelB)
+
+        # Once the added field has been seen, setting the same model again
+        # doesn't touch the fields.
+        form.fields['other'].model = None
+        form.lazy_model = ModelB
+        self.assertIsNone(form.fields['other'].model)
@@ -0,0 +1,84 @@
+from django.db import models
+from django.forms import Select, SelectMultiple
+from django.utils import translation
+
+from lazychoices.forms import LazyChoiceAutocomplete, LazyChoiceField, LazyChoiceSelect
+
+from .base import IsolatedModelsTestCase
+
+
+class LazyChoiceSelectMultiple(LazyChoiceSelect):
+    allow_multiple_selected = True
+
+
+class LazyChoiceSelectTests(IsolatedModelsTestCase):
+    def test_renders_like_select(self):
+        class Model(models.Model):
+            FIELD_CHOICES = [
+                ('Group', [('foo', 'Foo'), ('bar', 'Bar & Co')]),
+                ('baz', 'Baz'),
+                ('foo', 'Foo again'),
+            ]
+
+        f = LazyChoiceField(model=Model, choices_name='FIELD_CHOICES')
+        self.assertIsInstance(f.widget, LazyChoiceSelect)
+        select = Select(choices=f.choices)
+        for value in [None, '', 'foo', 'bar', 'baz', 'invalid']:
+            self.assertHTMLEqual(f.widget.render('field', value), select.render('field', value))
+            self.assertEqual(f.widget.render('field', value), select.render('field', value))
+
+    def test_renders_multiple_like_select_multiple(self):
+        class Model(models.Model):
+            FIELD_CHOICES = [('foo', 'Foo'), ('bar', 'Bar'), ('foo', 'Foo again')]
+
+        f = LazyChoiceField(model=Model, choices_name='FIELD_CHOICES', widget=LazyChoiceSelectMultiple)
+        select = SelectMultiple(choices=f.choices)
+        for value in [[], ['foo'], ['bar', 'foo']]:
+            self.assertEqual(
+                f.widget.render_options((), value),
+                select.render_options((), value),
+            )
+
+    def test_rendered_options_are_shared(self):
+        class Model(models.Model):
+            FIELD_CHOICES = [('foo', 'Foo'), ('bar', 'Bar')]
+
+        f1 = LazyChoiceField(model=Model, choices_name='FIELD_CHOICES')
+        f2 = LazyChoiceField(model=Model, choices_name='FIELD_CHOICES')
+        f1.widget.render('field', 'foo')
+        self.assertIs(f1.widget.model_choices, f2.widget.model_choices)
+        self.assertEqual(len(f2.widget.model_choices.rendered), 1)
+
+        with translation.override('fr'):
+            f2.widget.render('field', 'bar')
+        self.assertEqual(len(f2.widget.model_choices.rendered), 2)
+
+    def test_replaced_choices(self):
+        class Model(models.Model):
+            FIELD_CHOICES = [('foo', 'Foo'), ('bar', 'Bar')]
+
+        f = LazyChoiceField(model=Model, choices_name='FIELD_CHOICES')
+        f.choices = [('baz', 'Baz')]
+        self.assertHTMLEqual(
+            f.widget.render('field', 'baz'),
+            '<select name="field"><option value="baz" selected="selected">Baz</option></select>',
+        )
+
+
+class LazyChoiceAutocompleteTests(IsolatedModelsTestCase):
+    def test_renders_selected_options(self):
+        class Model(models.Model):
+            FIELD_CHOICES = [('Group', [('foo', 'Foo'), ('bar', 'Bar')]), ('baz', 'Baz')]
+
+        f = LazyChoiceField(model=Model, choices_name='FIELD_CHOICES', widget=LazyChoiceAutocomplete(url='/search/'))
+        self.assertHTMLEqual(
+            f.widget.render('field', 'bar'),
+            '<select name="field" data-lazychoices-url="/search/">'
+            '<option value="">---------</option>'
+            '<option value="bar" selected="selected">Bar</option>'
+            '</select>',
+        )
+        self.assertHTMLEqual(
+            f.widget.render('field', 'invalid'),
+            '<select name="field" data-lazychoices-url="/search/"><option value="">---------</option></select>',
+        )
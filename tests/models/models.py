@@ -0,0 +1,43 @@
+from django.db import models
+
+from lazychoices.models import CodedLazyChoiceField, LazyChoiceField, LazyChoiceModelMixin, LazyChoiceQuerySet
+
+
+class Book(LazyChoiceModelMixin, models.Model):
+    CATEGORY_CHOICES = [
+        ('Books', [('fiction', 'Fiction'), ('non-fiction', 'Non-Fiction')]),
+        ('other', 'Other'),
+    ]
+
+    kind = models.CharField(max_length=10, blank=True)
+    category = LazyChoiceField()
+
+    objects = LazyChoiceQuerySet.as_manager()
+
+
+class Comic(Book):
+    CATEGORY_CHOICES = [('manga', 'Manga'), ('superhero', 'Superhero')]
+
+    class Meta:
+        proxy = True
+
+
+class Magazine(LazyChoiceModelMixin, models.Model):
+    CATEGORY_CHOICES = [('fiction', 'Fiction'), ('non-fiction', 'Non-Fiction')]
+
+    category = CodedLazyChoiceField(codes={'fiction': 1, 'non-fiction': 2, 'other': 3}, null=True)
+
+    objects = LazyChoiceQuerySet.as_manager()
+
+
+class Journal(LazyChoiceModelMixin, models.Model):
+    CATEGORY_CHOICES = [('fiction', 'Fiction'), ('non-fiction', 'Non-Fiction')]
+
+    category = LazyChoiceField(check_choices=True)
+
+
+class Quarterly(Journal):
+    CATEGORY_CHOICES = [('poetry', 'Poetry')]
+
+    class Meta:
+        proxy = True
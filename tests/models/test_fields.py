@@ -1,9 +1,10 @@
 from django.core import checks, exceptions
-from django.db import models
+from django.db import IntegrityError, connection, models, transaction
 
-from lazychoices import LazyChoiceField, LazyChoiceModelMixin, forms
+from lazychoices import ChoiceProvider, CodedLazyChoiceField, LazyChoiceField, LazyChoiceModelMixin, forms
 
 from .base import IsolatedModelsTestCase
+from .models import Journal, Magazine, Quarterly
 
 
 class AbstractModel(LazyChoiceModelMixin, models.Model):
@@ -98,6 +99,103 @@ class LazyChoiceFieldTests(IsolatedModelsTestCase):
         ]
         self.assertEqual(errors, expected)
 
+    def test_choices_containing_invalid_groups(self):
+        class Model(AbstractModel):
+            FIELD_CHOICES = [('Group', ['foo'])]
+
+        errors = Model._meta.get_field('field').check()
+        expected = [
+            checks.Error(
+                "'FIELD_CHOICES' must be an iterable containing (actual value, human readable name) tuples.",
+                hint=None,
+                obj=Model,
+                id='lazychoices.E002',
+            ),
+        ]
+        self.assertEqual(errors, expected)
+
+    def test_nested_subclasses(self):
+        class Model(AbstractModel):
+            FIELD_CHOICES = [('foo', 'Foo')]
+
+        class Proxy(Model):
+            class Meta:
+                proxy = True
+
+        class NestedProxy(Proxy):
+            FIELD_CHOICES = 'foo'
+
+            class Meta:
+                proxy = True
+
+        errors = Model._meta.get_field('field').check()
+        expected = [
+            checks.Error(
+                "'FIELD_CHOICES' must be an iterable (e.g., a list or tuple).",
+                hint=None,
+                obj=NestedProxy,
+                id='lazychoices.E001',
+            ),
+        ]
+        self.assertEqual(errors, expected)
+
+    def test_choices_longer_than_max_length(self):
+        class Model(LazyChoiceModelMixin, models.Model):
+            FIELD_CHOICES = [('Group', [('foo', 'Foo'), ('foobar', 'Foobar')])]
+            field = LazyChoiceField(max_length=5)
+
+        errors = Model._meta.get_field('field').check()
+        expected = [
+            checks.Error(
+                "'FIELD_CHOICES' contains values longer than 'max_length' (5): 'foobar'.",
+                hint="Shorten the values or increase the field's 'max_length'.",
+                obj=Model,
+                id='lazychoices.E006',
+            ),
+        ]
+        self.assertEqual(errors, expected)
+
+    def test_duplicate_choices(self):
+        class Model(AbstractModel):
+            FIELD_CHOICES = [('Group', [('foo', 'Foo'), ('bar', 'Bar')]), ('foo', 'Other Foo')]
+
+        errors = Model._meta.get_field('field').check()
+        expected = [
+            checks.Warning(
+                "'FIELD_CHOICES' contains duplicate values: 'foo'.",
+                hint='Only the last label of each value is displayed.',
+                obj=Model,
+                id='lazychoices.W001',
+            ),
+        ]
+        self.assertEqual(errors, expected)
+
+    def test_unhashable_choices(self):
+        class Model(AbstractModel):
+            FIELD_CHOICES = [(['x'], 'X'), ('a', 'A'), ('a', 'Other A')]
+
+        errors = Model._meta.get_field('field').check()
+        expected = [
+            checks.Warning(
+                "'FIELD_CHOICES' contains duplicate values: 'a'.",
+                hint='Only the last label of each value is displayed.',
+                obj=Model,
+                id='lazychoices.W001',
+            ),
+        ]
+        self.assertEqual(errors, expected)
+
+    def test_provided_choices(self):
+        class Model(AbstractModel):
+            FIELD_CHOICES = ChoiceProvider(lambda model: [('foo', 'Foo'), ('bar', 'Bar')])
+
+        field = Model._meta.get_field('field')
+        self.assertEqual(field.check(), [])
+        self.assertEqual('foo', field.clean('foo', Model()))
+        self.assertEqual(Model(field='bar').get_field_display(), 'Bar')
+        with self.assertRaisesMessage(exceptions.ValidationError, "Value 'baz' is not a valid choice."):
+            field.clean('baz', Model())
+
     def test_model_without_mixin(self):
         class Model(models.Model):
             field = LazyChoiceField()
@@ -166,6 +264,57 @@ class LazyChoiceFieldTests(IsolatedModelsTestCase):
         with self.assertRaisesMessage(exceptions.ValidationError, "Value 'baz' is not a valid choice."):
             Model._meta.get_field('field').clean('baz', Model())
 
+    def test_cleans_valid_choice_with_many_choices(self):
+        class Model(models.Model):
+            FIELD_CHOICES = [
+                ('group-{0}'.format(i), [('choice-{0}-{1}'.format(i, j), 'Choice') for j in range(100)])
+                for i in range(100)
+            ]
+            field = LazyChoiceField()
+
+        field = Model._meta.get_field('field')
+        self.assertEqual('choice-99-99', field.clean('choice-99-99', Model()))
+        with self.assertRaisesMessage(exceptions.ValidationError, "Value 'group-0' is not a valid choice."):
+            field.clean('group-0', Model())
+
+    def test_cleans_valid_unhashable_choice(self):
+        class Model(models.Model):
+            FIELD_CHOICES = [(['foo'], 'Foo'), ('bar', 'Bar')]
+            field = LazyChoiceField()
+
+        field = Model._meta.get_field('field')
+        field.validate(['foo'], Model())
+        with self.assertRaises(exceptions.ValidationError):
+            field.validate(['bar'], Model())
+
+    def test_raises_error_on_empty_input_with_choices(self):
+        class Model(models.Model):
+            FIELD_CHOICES = [('foo', 'Foo'), ('bar', 'Bar')]
+            field = LazyChoiceField(null=False)
+
+        with self.assertRaisesMessage(exceptions.ValidationError, "'This field cannot be null.'"):
+            Model._meta.get_field('field').clean(None, Model())
+        with self.assertRaisesMessage(exceptions.ValidationError, "'This field cannot be blank.'"):
+            Model._meta.get_field('field').clean('', Model())
+
+    def test_validate_many(self):
+        class Model(AbstractModel):
+            FIELD_CHOICES = [('foo', 'Foo'), ('bar', 'Bar')]
+
+        class Proxy(Model):
+            FIELD_CHOICES = [(1, [('baz', 'Baz')])]
+
+            class Meta:
+                proxy = True
+
+        instances = [Model(field='foo'), Proxy(field='foo'), Model(field=''), Proxy(field='baz'), Model(field='baz')]
+        field = Model._meta.get_field('field')
+        errors = field.validate_many(iter(instances))
+        self.assertEqual([instance for instance, error in errors], [instances[1], instances[2], instances[4]])
+
+        errors = field.validate_many(instances)
+        self.assertEqual([error.code for instance, error in errors], ['invalid_choice', 'blank', 'invalid_choice'])
+
     def test_formfield(self):
         class Model(models.Model):
             field = LazyChoiceField()
@@ -224,3 +373,207 @@ class LazyChoiceFieldTests(IsolatedModelsTestCase):
             field.formfield(foo='bar')
         except TypeError as err:
             self.fail(err.message)
+
+
+class CheckChoicesTests(IsolatedModelsTestCase):
+    def test_check_constraint(self):
+        Journal.objects.create(category='fiction')
+        Quarterly.objects.create(category='poetry')
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Journal.objects.create(category='unknown')
+
+    def test_check_values(self):
+        field = Journal._meta.get_field('category')
+        self.assertEqual(field.get_check_values(), ('fiction', 'non-fiction', 'poetry'))
+        self.assertEqual(
+            field.db_parameters(connection)['check'],
+            "{0} IN ('fiction', 'non-fiction', 'poetry')".format(connection.ops.quote_name('category')),
+        )
+
+    def test_check_values_blank(self):
+        class Model(LazyChoiceModelMixin, models.Model):
+            FIELD_CHOICES = [("it's", 'Quoted')]
+            field = LazyChoiceField(blank=True, check_choices=True)
+
+        field = Model._meta.get_field('field')
+        self.assertEqual(field.get_check_values(), ('', "it's"))
+        self.assertIn("IN ('', 'it''s')", field.db_parameters(connection)['check'])
+
+    def test_check_values_coded(self):
+        class Model(LazyChoiceModelMixin, models.Model):
+            FIELD_CHOICES = [('foo', 'Foo'), ('bar', 'Bar')]
+            field = CodedLazyChoiceField(codes={'foo': 1, 'bar': 2}, blank=True, null=True, check_choices=True)
+
+        field = Model._meta.get_field('field')
+        self.assertEqual(field.get_check_values(), ('bar', 'foo'))
+        self.assertIn('IN (2, 1)', field.db_parameters(connection)['check'])
+
+    def test_check_values_provider(self):
+        class Model(LazyChoiceModelMixin, models.Model):
+            FIELD_CHOICES = ChoiceProvider(lambda model: [('foo', 'Foo')])
+            field = LazyChoiceField(check_choices=True)
+
+        field = Model._meta.get_field('field')
+        self.assertIsNone(field.get_check_values())
+        self.assertIsNone(field.db_parameters(connection)['check'])
+
+    def test_no_check(self):
+        class Model(LazyChoiceModelMixin, models.Model):
+            FIELD_CHOICES = [('foo', 'Foo')]
+            field = LazyChoiceField()
+
+        field = Model._meta.get_field('field')
+        self.assertIsNone(field.get_check_values())
+        self.assertIsNone(field.db_parameters(connection)['check'])
+        self.assertNotIn('check_choices', field.deconstruct()[3])
+
+    def test_deconstruct(self):
+        name, path, args, kwargs = Journal._meta.get_field('category').deconstruct()
+        self.assertEqual(kwargs['check_choices'], ('fiction', 'non-fiction', 'poetry'))
+
+        field = LazyChoiceField(**kwargs)
+        self.assertEqual(field.get_check_values(), ('fiction', 'non-fiction', 'poetry'))
+        self.assertEqual(LazyChoiceField(check_choices=True).deconstruct()[3]['check_choices'], True)
+
+
+class CodedLazyChoiceFieldTests(IsolatedModelsTestCase):
+    def test_stores_codes(self):
+        fiction = Magazine.objects.create(category='fiction')
+        Magazine.objects.create(category='non-fiction')
+        Magazine.objects.create(category=None)
+
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT category FROM models_magazine ORDER BY id')
+            self.assertEqual([row[0] for row in cursor.fetchall()], [1, 2, None])
+
+        self.assertEqual(Magazine.objects.get(pk=fiction.pk).category, 'fiction')
+        self.assertEqual(list(Magazine.objects.filter(category='fiction')), [fiction])
+        self.assertEqual(Magazine.objects.filter(category__in=['fiction', 'non-fiction']).count(), 2)
+        self.assertEqual(
+            list(Magazine.objects.order_by('pk').values_list('category', flat=True)),
+            ['fiction', 'non-fiction', None],
+        )
+        queryset = Magazine.objects.annotate_display('category').order_by('pk')
+        self.assertEqual([magazine.category_display for magazine in queryset][:2], ['Fiction', 'Non-Fiction'])
+
+    def test_lookup_value_without_code(self):
+        fiction = Magazine.objects.create(category='fiction')
+        non_fiction = Magazine.objects.create(category='non-fiction')
+        Magazine.objects.create(category=None)
+
+        self.assertEqual(list(Magazine.objects.filter(category='unknown')), [])
+        self.assertEqual(list(Magazine.objects.filter(category=['x'])), [])
+        self.assertEqual(list(Magazine.objects.filter(category__in=['unknown'])), [])
+        self.assertEqual(list(Magazine.objects.filter(category__in=['fiction', 'unknown'])), [fiction])
+        self.assertEqual(Magazine.objects.exclude(category='unknown').count(), 3)
+        self.assertEqual(
+            list(Magazine.objects.exclude(category__in=['fiction', 'unknown']).filter(category__isnull=False)),
+            [non_fiction],
+        )
+
+    def test_blank_stored_as_null(self):
+        magazine = Magazine.objects.create(category='')
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT category FROM models_magazine')
+            self.assertEqual([row[0] for row in cursor.fetchall()], [None])
+        self.assertIsNone(Magazine.objects.get(pk=magazine.pk).category)
+
+    def test_lookup_blank(self):
+        fiction = Magazine.objects.create(category='fiction')
+        non_fiction = Magazine.objects.create(category='non-fiction')
+        blank = Magazine.objects.create(category='')
+
+        self.assertEqual(list(Magazine.objects.filter(category='')), [blank])
+        self.assertEqual(list(Magazine.objects.exclude(category='').order_by('pk')), [fiction, non_fiction])
+        self.assertEqual(list(Magazine.objects.filter(category__in=['']).order_by('pk')), [blank])
+        self.assertEqual(
+            list(Magazine.objects.filter(category__in=['', 'fiction', 'unknown']).order_by('pk')),
+            [fiction, blank],
+        )
+        self.assertEqual(list(Magazine.objects.exclude(category__in=['', 'fiction'])), [non_fiction])
+
+    def test_blank_without_null(self):
+        class Model(LazyChoiceModelMixin, models.Model):
+            FIELD_CHOICES = [('foo', 'Foo')]
+            field = CodedLazyChoiceField(codes={'foo': 1}, blank=True)
+
+        errors = Model._meta.get_field('field').check()
+        expected = [
+            checks.Error(
+                "'blank=True' requires 'null=True', as blank values are stored as NULL.",
+                hint='Set null=True on the field.',
+                obj=Model._meta.get_field('field'),
+                id='lazychoices.E007',
+            ),
+        ]
+        self.assertEqual(errors, expected)
+
+    def test_unhashable_value_without_code(self):
+        class Model(LazyChoiceModelMixin, models.Model):
+            FIELD_CHOICES = [(['x'], 'X'), ('a', 'A')]
+            field = CodedLazyChoiceField(codes={'a': 1})
+
+        errors = Model._meta.get_field('field').check()
+        expected = [
+            checks.Error(
+                "'FIELD_CHOICES' contains values without a code: ['x'].",
+                hint="Add a code for each value to the field's 'codes'.",
+                obj=Model,
+                id='lazychoices.E004',
+            ),
+        ]
+        self.assertEqual(errors, expected)
+
+    def test_value_without_code(self):
+        with self.assertRaisesMessage(ValueError, "'unknown' has no code in the field's 'codes'."):
+            Magazine.objects.create(category='unknown')
+
+    def test_deconstruct(self):
+        name, path, args, kwargs = Magazine._meta.get_field('category').deconstruct()
+        self.assertEqual(path, 'lazychoices.models.fields.CodedLazyChoiceField')
+        self.assertEqual(kwargs['codes'], {'fiction': 1, 'non-fiction': 2, 'other': 3})
+
+    def test_missing_codes(self):
+        class Model(LazyChoiceModelMixin, models.Model):
+            FIELD_CHOICES = [('foo', 'Foo'), ('bar', 'Bar')]
+            field = CodedLazyChoiceField(codes={'foo': 1})
+
+        class Proxy(Model):
+            FIELD_CHOICES = [(1, [('foo', 'Foo'), ('baz', 'Baz')])]
+
+            class Meta:
+                proxy = True
+
+        errors = Model._meta.get_field('field').check()
+        expected = [
+            checks.Error(
+                "'FIELD_CHOICES' contains values without a code: 'bar'.",
+                hint="Add a code for each value to the field's 'codes'.",
+                obj=Model,
+                id='lazychoices.E004',
+            ),
+            checks.Error(
+                "'FIELD_CHOICES' contains values without a code: 'baz'.",
+                hint="Add a code for each value to the field's 'codes'.",
+                obj=Proxy,
+                id='lazychoices.E004',
+            ),
+        ]
+        self.assertEqual(errors, expected)
+
+    def test_invalid_codes(self):
+        class Model(LazyChoiceModelMixin, models.Model):
+            FIELD_CHOICES = [('foo', 'Foo'), ('bar', 'Bar')]
+            field = CodedLazyChoiceField(codes={'foo': 1, 'bar': 1})
+
+        field = Model._meta.get_field('field')
+        errors = field.check()
+        expected = [
+            checks.Error(
+                "'codes' must map each value to a unique integer between 0 and 32767.",
+                hint=None,
+                obj=field,
+                id='lazychoices.E005',
+            ),
+        ]
+        self.assertEqual(errors, expected)
@@ -1,8 +1,12 @@
 from django.db import models
+from django.test import TestCase
 
-from lazychoices.models import LazyChoiceField, LazyChoiceModelMixin
+from lazychoices.choices import get_choice_index
+from lazychoices.models import LazyChoiceField, LazyChoiceModelMixin, resolve_displays
+from lazychoices.test import CaptureChoiceEvents
 
 from .base import IsolatedModelsTestCase
+from .models import Book, Comic
 
 
 class LazyChoiceModelMixinTests(IsolatedModelsTestCase):
@@ -37,3 +41,58 @@ class LazyChoiceModelMixinTests(IsolatedModelsTestCase):
         m1.field = p1.field = 'invalid'
         self.assertEqual(m1.get_field_display(), 'invalid')
         self.assertEqual(p1.get_field_display(), 'invalid')
+
+    def test_display_duplicate_keys(self):
+        class Model(LazyChoiceModelMixin, models.Model):
+            FIELD_CHOICES = [('foo', 'Foo'), ('foo', 'Foo again')]
+            field = LazyChoiceField()
+
+        self.assertEqual(Model(field='foo').get_field_display(), 'Foo again')
+
+    def test_display_reuses_choice_index(self):
+        class Model(LazyChoiceModelMixin, models.Model):
+            FIELD_CHOICES = [('foo', 'Foo')]
+            field = LazyChoiceField()
+
+        index = get_choice_index(Model, 'FIELD_CHOICES')
+        self.assertEqual(Model(field='foo').get_field_display(), 'Foo')
+        self.assertEqual(Model(field='foo').get_field_display(), 'Foo')
+        self.assertIs(get_choice_index(Model, 'FIELD_CHOICES'), index)
+
+        Model.FIELD_CHOICES = [('foo', 'New Foo')]
+        self.assertEqual(Model(field='foo').get_field_display(), 'New Foo')
+
+
+class ResolveDisplaysTests(TestCase):
+    def test_resolve_displays(self):
+        instances = [Book(category='fiction'), Comic(category='manga'), Book(category='unknown'), Comic(category='')]
+        self.assertEqual(list(resolve_displays(iter(instances), 'category')), [
+            (instances[0], 'Fiction'),
+            (instances[1], 'Manga'),
+            (instances[2], 'unknown'),
+            (instances[3], ''),
+        ])
+        for instance, label in resolve_displays(instances, 'category'):
+            self.assertEqual(label, instance.get_category_display())
+
+    def test_resolved_once_per_class(self):
+        instances = [Book(category='fiction'), Comic(category='manga')] * 50
+        with CaptureChoiceEvents() as captured:
+            labels = [label for instance, label in resolve_displays(instances, 'category')]
+        self.assertEqual(labels, ['Fiction', 'Manga'] * 50)
+        self.assertEqual(captured.count('lookup'), 2)
+
+    def test_lazy(self):
+        def generate():
+            yield Book(category='fiction')
+            raise AssertionError('Consumed too far.')
+
+        self.assertEqual(next(resolve_displays(generate(), 'category'))[1], 'Fiction')
+
+    def test_discriminator(self):
+        Book.objects.create(category='fiction')
+        Book.objects.create(kind='comic', category='manga')
+        displays = resolve_displays(
+            Book.objects.order_by('pk').iterator(), 'category', discriminator='kind', subclasses={'comic': Comic},
+        )
+        self.assertEqual([label for book, label in displays], ['Fiction', 'Manga'])
@@ -0,0 +1,164 @@
+from django.db.models import F
+from django.test import TestCase
+
+from lazychoices.choices import get_label_keys
+from lazychoices.models import display_case
+
+from .models import Book, Comic, Magazine
+
+
+class LazyChoiceQuerySetTests(TestCase):
+    def setUp(self):
+        self.fiction = Book.objects.create(category='fiction')
+        self.other = Book.objects.create(category='other')
+        self.unknown = Book.objects.create(category='unknown')
+        self.manga = Book.objects.create(kind='comic', category='manga')
+        self.superhero = Book.objects.create(kind='comic', category='superhero')
+
+    def test_annotate_display(self):
+        queryset = Book.objects.annotate_display('category').order_by('pk')
+        self.assertEqual(
+            [book.category_display for book in queryset],
+            ['Fiction', 'Other', 'unknown', 'manga', 'superhero'],
+        )
+
+    def test_annotate_display_with_alias(self):
+        queryset = Book.objects.annotate_display('category', alias='label').filter(label='Fiction')
+        self.assertEqual(list(queryset), [self.fiction])
+
+    def test_annotate_display_with_discriminator(self):
+        queryset = Book.objects.annotate_display(
+            'category', discriminator='kind', subclasses={'comic': Comic},
+        ).order_by('category_display')
+        self.assertEqual(
+            [book.category_display for book in queryset],
+            ['Fiction', 'Manga', 'Other', 'Superhero', 'unknown'],
+        )
+
+    def test_proxy_choices(self):
+        queryset = Comic.objects.annotate_display('category').filter(kind='comic').order_by('-category_display')
+        self.assertEqual([book.pk for book in queryset], [self.superhero.pk, self.manga.pk])
+
+    def test_display_case_without_choices(self):
+        Book.CATEGORY_CHOICES, choices = [], Book.CATEGORY_CHOICES
+        try:
+            queryset = Book.objects.annotate(label=display_case(Book, 'category')).order_by('pk')
+            self.assertEqual([book.label for book in queryset][:2], ['fiction', 'other'])
+        finally:
+            Book.CATEGORY_CHOICES = choices
+
+
+class LabelLookupTests(TestCase):
+    def setUp(self):
+        self.fiction = Book.objects.create(category='fiction')
+        self.non_fiction = Book.objects.create(category='non-fiction')
+        self.manga = Book.objects.create(kind='comic', category='manga')
+        self.fiction_magazine = Magazine.objects.create(category='fiction')
+
+    def test_label(self):
+        self.assertEqual(list(Book.objects.filter(category__label='Non-Fiction')), [self.non_fiction])
+        self.assertEqual(list(Book.objects.exclude(category__label='Non-Fiction').order_by('pk')), [
+            self.fiction, self.manga,
+        ])
+
+    def test_label_of_subclass(self):
+        self.assertEqual(list(Book.objects.filter(category__label='Manga')), [self.manga])
+        self.assertEqual(list(Comic.objects.filter(category__label='Manga')), [self.manga])
+
+    def test_unknown_label(self):
+        with self.assertNumQueries(0):
+            self.assertEqual(list(Book.objects.filter(category__label='Unknown')), [])
+        self.assertEqual(Book.objects.exclude(category__label='Unknown').count(), 3)
+
+    def test_coded_field(self):
+        self.assertEqual(list(Magazine.objects.filter(category__label='Fiction')), [self.fiction_magazine])
+
+    def test_duplicate_labels(self):
+        class Model(object):
+            FIELD_CHOICES = [('Group', [('foo', 'Foo')]), ('bar', 'Bar'), ('foo2', 'Foo')]
+
+        class Proxy(Model):
+            FIELD_CHOICES = [('foo3', 'Foo'), ('foo', 'Foo')]
+
+        self.assertEqual(get_label_keys(Model, 'FIELD_CHOICES', 'Foo'), ['foo', 'foo2', 'foo3'])
+        self.assertEqual(get_label_keys(Proxy, 'FIELD_CHOICES', 'Foo'), ['foo3', 'foo'])
+        self.assertEqual(get_label_keys(Model, 'FIELD_CHOICES', 'Baz'), [])
+
+
+class ValuesWithDisplayTests(TestCase):
+    def setUp(self):
+        self.fiction = Book.objects.create(category='fiction')
+        self.other = Book.objects.create(category='other')
+        self.unknown = Book.objects.create(category='unknown')
+        self.manga = Book.objects.create(kind='comic', category='manga')
+
+    def test_values_with_display(self):
+        self.assertEqual(list(Book.objects.values_with_display('category')), [
+            {'category': 'fiction', 'category_display': 'Fiction'},
+            {'category': 'other', 'category_display': 'Other'},
+            {'category': 'unknown', 'category_display': 'unknown'},
+            {'category': 'manga', 'category_display': 'manga'},
+        ])
+
+    def test_all_fields(self):
+        rows = list(Book.objects.filter(pk=self.fiction.pk).values_with_display())
+        self.assertEqual(rows, [
+            {'id': self.fiction.pk, 'kind': '', 'category': 'fiction', 'category_display': 'Fiction'},
+        ])
+
+    def test_chunks(self):
+        queryset = Book.objects.order_by('-pk').values_with_display('pk', 'category', chunk_size=2)
+        with self.assertNumQueries(3):
+            rows = list(queryset)
+        self.assertEqual([row['pk'] for row in rows], [self.manga.pk, self.unknown.pk, self.other.pk, self.fiction.pk])
+
+        with self.assertNumQueries(4):
+            self.assertEqual(len(list(Book.objects.exclude(pk=self.manga.pk).values_with_display(chunk_size=1))), 3)
+
+    def test_ordered(self):
+        Book.objects.create(category='other')
+        queryset = Book.objects.order_by('-category').values_with_display('category', chunk_size=2)
+        with self.assertNumQueries(3):
+            rows = list(queryset)
+        self.assertEqual(
+            [row['category'] for row in rows],
+            ['unknown', 'other', 'other', 'manga', 'fiction'],
+        )
+        self.assertEqual(set(rows[0]), {'category', 'category_display'})
+
+    def test_ordered_by_expression(self):
+        # Expressions and nullable or related columns can't be paginated on
+        # the last row, so the chunks are read at an offset.
+        queryset = Book.objects.order_by(F('kind').desc(), 'category')
+        with self.assertNumQueries(3):
+            rows = list(queryset.values_with_display('kind', 'category', chunk_size=2))
+        self.assertEqual(
+            [row['category'] for row in rows],
+            ['manga', 'fiction', 'other', 'unknown'],
+        )
+
+    def test_random_ordering(self):
+        with self.assertRaises(TypeError):
+            list(Book.objects.order_by('?').values_with_display('category'))
+        self.assertEqual(len(list(Book.objects.order_by('?')[:2].values_with_display('category'))), 2)
+
+    def test_sliced(self):
+        rows = Book.objects.order_by('pk')[1:3].values_with_display('category', chunk_size=1)
+        self.assertEqual([row['category'] for row in rows], ['other', 'unknown'])
+
+    def test_discriminator(self):
+        rows = list(Book.objects.values_with_display(
+            'category', discriminator='kind', subclasses={'comic': Comic},
+        ))
+        self.assertEqual([row['category_display'] for row in rows], ['Fiction', 'Other', 'unknown', 'Manga'])
+        self.assertNotIn('kind', rows[0])
+
+    def test_coded_field(self):
+        Magazine.objects.create(category='non-fiction')
+        self.assertEqual(list(Magazine.objects.values_with_display('category')), [
+            {'category': 'non-fiction', 'category_display': 'Non-Fiction'},
+        ])
+
+    def test_unexpected_kwarg(self):
+        with self.assertRaisesMessage(TypeError, "unexpected keyword argument 'foo'"):
+            list(Book.objects.values_with_display('category', foo='bar'))
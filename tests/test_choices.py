@@ -0,0 +1,328 @@
+import time
+
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.test import SimpleTestCase, TestCase
+
+from lazychoices.choices import ChoiceIndex, ChoiceProvider, ChoiceSearchIndex, get_choice_index, invalidate
+from lazychoices.forms.fields import LazyChoiceField
+from lazychoices.signals import choices_invalidated, invalidate_on_change
+from tests.admin.models import Book, Chapter
+
+
+class ChoiceIndexTests(SimpleTestCase):
+    def test_flat_choices(self):
+        index = ChoiceIndex([('foo', 'Foo'), ('bar', 'Bar')])
+        self.assertEqual(index.flat, (('foo', 'Foo'), ('bar', 'Bar')))
+        self.assertEqual(index.labels, {'foo': 'Foo', 'bar': 'Bar'})
+        self.assertEqual(index.groups, {'foo': None, 'bar': None})
+        self.assertEqual(index.order, {'foo': 0, 'bar': 1})
+
+    def test_grouped_choices(self):
+        index = ChoiceIndex([
+            ('Group', [('foo', 'Foo'), ('bar', 'Bar')]),
+            ('baz', 'Baz'),
+        ])
+        self.assertEqual(index.flat, (('foo', 'Foo'), ('bar', 'Bar'), ('baz', 'Baz')))
+        self.assertEqual(index.groups, {'foo': 'Group', 'bar': 'Group', 'baz': None})
+        self.assertEqual(index.order, {'foo': 0, 'bar': 1, 'baz': 2})
+
+    def test_generator(self):
+        index = ChoiceIndex((key, key.title()) for key in ['foo', 'bar'])
+        self.assertEqual(index.choices, (('foo', 'Foo'), ('bar', 'Bar')))
+        self.assertEqual(index.flat, index.choices)
+
+    def test_duplicate_keys(self):
+        # The last label wins, as with dict(flatten_choices(choices)).
+        index = ChoiceIndex([('Group', [('foo', 'Foo')]), ('bar', 'Bar'), ('foo', 'Foo again')])
+        self.assertEqual(index.labels, {'foo': 'Foo again', 'bar': 'Bar'})
+        self.assertEqual(index.order, {'foo': 0, 'bar': 1})
+        self.assertEqual(index.get_keys('Foo again'), ('foo',))
+        self.assertEqual(index.get_keys('Foo'), ())
+
+    def test_get_label(self):
+        index = ChoiceIndex([('foo', 'Foo')])
+        self.assertEqual(index.get_label('foo'), 'Foo')
+        self.assertEqual(index.get_label('bar'), None)
+        self.assertEqual(index.get_label('bar', 'bar'), 'bar')
+        self.assertEqual(index.get_label(['foo'], 'default'), 'default')
+
+    def test_contains(self):
+        index = ChoiceIndex([('Group', [('foo', 'Foo')]), ('bar', 'Bar')])
+        self.assertIn('foo', index)
+        self.assertIn('bar', index)
+        self.assertNotIn('Group', index)
+        self.assertNotIn('baz', index)
+        self.assertNotIn(['foo'], index)
+
+    def test_unhashable_keys(self):
+        index = ChoiceIndex([(['foo'], 'Foo'), ('bar', 'Bar')])
+        self.assertEqual(index.flat, ((['foo'], 'Foo'), ('bar', 'Bar')))
+        self.assertEqual(index.labels, {'bar': 'Bar'})
+        self.assertEqual(index.unhashable, (['foo'],))
+        self.assertIn(['foo'], index)
+        self.assertIn('bar', index)
+        self.assertNotIn(['bar'], index)
+
+
+class ChoiceSearchIndexTests(SimpleTestCase):
+    def setUp(self):
+        self.index = ChoiceSearchIndex([
+            ('foo', 'Foo'), ('bar', 'Bar'), ('baz', 'Food\nBaz'), (None, 'None'), (1, 'One'),
+        ])
+
+    def test_search(self):
+        self.assertEqual(self.index.search('FO'), ([('foo', 'Foo'), ('baz', 'Food\nBaz')], False))
+        self.assertEqual(self.index.search('ba'), ([('bar', 'Bar'), ('baz', 'Food\nBaz')], False))
+        self.assertEqual(self.index.search('1'), ([(1, 'One')], False))
+        self.assertEqual(self.index.search('d b'), ([('baz', 'Food\nBaz')], False))
+        self.assertEqual(self.index.search('o\tf'), ([], False))
+        self.assertEqual(self.index.search('qux'), ([], False))
+
+    def test_pagination(self):
+        self.assertEqual(self.index.search('o', limit=2), ([('foo', 'Foo'), ('baz', 'Food\nBaz')], True))
+        self.assertEqual(self.index.search('o', offset=2, limit=2), ([(None, 'None'), (1, 'One')], False))
+        self.assertEqual(self.index.search('', offset=3, limit=1), ([(None, 'None')], True))
+        self.assertEqual(self.index.search('', offset=4, limit=1), ([(1, 'One')], False))
+
+    def test_choice_index_search(self):
+        index = ChoiceIndex([('Group', [('foo', 'Foo'), ('bar', 'Bar')]), ('baz', 'Baz')])
+        self.assertEqual(index.search('ba', limit=1), ([('bar', 'Bar')], True))
+        self.assertEqual(index.search('group'), ([], False))
+
+
+class GetChoiceIndexTests(SimpleTestCase):
+    def test_cached_per_class(self):
+        class Model(object):
+            FIELD_CHOICES = [('foo', 'Foo')]
+
+        index = get_choice_index(Model, 'FIELD_CHOICES')
+        self.assertIs(get_choice_index(Model, 'FIELD_CHOICES'), index)
+        self.assertIs(get_choice_index(Model(), 'FIELD_CHOICES'), index)
+
+    def test_subclasses(self):
+        class Model(object):
+            FIELD_CHOICES = [('foo', 'Foo')]
+
+        class Proxy(Model):
+            FIELD_CHOICES = [('bar', 'Bar')]
+
+        self.assertEqual(get_choice_index(Model, 'FIELD_CHOICES').flat, (('foo', 'Foo'),))
+        self.assertEqual(get_choice_index(Proxy, 'FIELD_CHOICES').flat, (('bar', 'Bar'),))
+
+    def test_reassigned_choices(self):
+        class Model(object):
+            FIELD_CHOICES = [('foo', 'Foo')]
+
+        index = get_choice_index(Model, 'FIELD_CHOICES')
+        Model.FIELD_CHOICES = [('bar', 'Bar')]
+        self.assertIsNot(get_choice_index(Model, 'FIELD_CHOICES'), index)
+        self.assertEqual(get_choice_index(Model, 'FIELD_CHOICES').flat, (('bar', 'Bar'),))
+
+    def test_missing_choices(self):
+        class Model(object):
+            pass
+
+        index = get_choice_index(Model, 'FIELD_CHOICES')
+        self.assertEqual(index.flat, ())
+        self.assertFalse(index)
+
+
+class ChoiceProviderTests(SimpleTestCase):
+    def setUp(self):
+        self.loaded = []
+
+    def load(self, model):
+        self.loaded.append(model)
+        return [('foo', 'Foo {0}'.format(len(self.loaded)))]
+
+    def test_loaded_once(self):
+        class Model(object):
+            FIELD_CHOICES = ChoiceProvider(self.load)
+
+        class Proxy(Model):
+            pass
+
+        index = get_choice_index(Model, 'FIELD_CHOICES')
+        self.assertEqual(index.flat, (('foo', 'Foo 1'),))
+        self.assertIs(get_choice_index(Model(), 'FIELD_CHOICES'), index)
+        self.assertEqual(get_choice_index(Proxy, 'FIELD_CHOICES').flat, (('foo', 'Foo 2'),))
+        self.assertEqual(self.loaded, [Model, Proxy])
+
+    def test_timeout(self):
+        class Model(object):
+            FIELD_CHOICES = ChoiceProvider(self.load, timeout=0)
+
+        self.assertEqual(get_choice_index(Model, 'FIELD_CHOICES').flat, (('foo', 'Foo 1'),))
+        self.assertEqual(get_choice_index(Model, 'FIELD_CHOICES').flat, (('foo', 'Foo 2'),))
+
+    def test_cache(self):
+        cache.clear()
+
+        class Model(object):
+            FIELD_CHOICES = ChoiceProvider(self.load, timeout=60, cache_alias='default')
+
+        self.assertEqual(get_choice_index(Model, 'FIELD_CHOICES').flat, (('foo', 'Foo 1'),))
+
+        # Another process would find the choices in the cache.
+        Model.FIELD_CHOICES = ChoiceProvider(self.load, timeout=60, cache_alias='default')
+        self.assertEqual(get_choice_index(Model, 'FIELD_CHOICES').flat, (('foo', 'Foo 1'),))
+        self.assertEqual(self.loaded, [Model])
+
+    def test_generator(self):
+        cache.clear()
+
+        def load(model):
+            return ((key, key.title()) for key in ['foo', 'bar'])
+
+        class Model(object):
+            FIELD_CHOICES = ChoiceProvider(load, timeout=60, cache_alias='default')
+
+        index = get_choice_index(Model, 'FIELD_CHOICES')
+        self.assertEqual(index.choices, (('foo', 'Foo'), ('bar', 'Bar')))
+        self.assertEqual(index.flat, (('foo', 'Foo'), ('bar', 'Bar')))
+        self.assertEqual(LazyChoiceField(model=Model, choices_name='FIELD_CHOICES').choices[1:], index.choices)
+
+        # The choices were stored into the cache.
+        Model.FIELD_CHOICES = ChoiceProvider(self.load, timeout=60, cache_alias='default')
+        self.assertEqual(get_choice_index(Model, 'FIELD_CHOICES').flat, (('foo', 'Foo'), ('bar', 'Bar')))
+        self.assertEqual(self.loaded, [])
+
+    def test_subclass(self):
+        class Provider(ChoiceProvider):
+            def load(self, model):
+                return [('bar', 'Bar')]
+
+        class Model(object):
+            FIELD_CHOICES = Provider()
+
+        self.assertEqual(get_choice_index(Model, 'FIELD_CHOICES').flat, (('bar', 'Bar'),))
+
+    def test_missing_load(self):
+        class Model(object):
+            FIELD_CHOICES = ChoiceProvider()
+
+        with self.assertRaises(NotImplementedError):
+            get_choice_index(Model, 'FIELD_CHOICES')
+
+
+class InvalidateTests(TestCase):
+    def setUp(self):
+        self.loaded = []
+
+    def load(self, model):
+        self.loaded.append(model)
+        return [('foo', 'Foo {0}'.format(len(self.loaded)))]
+
+    def test_invalidate(self):
+        class Model(object):
+            FIELD_CHOICES = [('foo', 'Foo')]
+            OTHER_CHOICES = [('bar', 'Bar')]
+
+        class Proxy(Model):
+            pass
+
+        indexes = [
+            get_choice_index(klass, name) for klass in [Model, Proxy] for name in ['FIELD_CHOICES', 'OTHER_CHOICES']
+        ]
+        invalidate(Model, 'field')
+        self.assertIsNot(get_choice_index(Model, 'FIELD_CHOICES'), indexes[0])
+        self.assertIs(get_choice_index(Model, 'OTHER_CHOICES'), indexes[1])
+        self.assertIsNot(get_choice_index(Proxy, 'FIELD_CHOICES'), indexes[2])
+        self.assertIs(get_choice_index(Proxy, 'OTHER_CHOICES'), indexes[3])
+
+        invalidate(Proxy)
+        self.assertIs(get_choice_index(Model, 'OTHER_CHOICES'), indexes[1])
+        self.assertIsNot(get_choice_index(Proxy, 'OTHER_CHOICES'), indexes[3])
+
+    def test_invalidate_model_fields(self):
+        index = get_choice_index(Book, 'GENRE_CHOICES')
+        invalidate(Book)
+        self.assertIsNot(get_choice_index(Book, 'GENRE_CHOICES'), index)
+
+    def test_invalidate_provider(self):
+        cache.clear()
+
+        class Model(object):
+            FIELD_CHOICES = ChoiceProvider(self.load, cache_alias='default')
+
+        self.assertEqual(get_choice_index(Model, 'FIELD_CHOICES').flat, (('foo', 'Foo 1'),))
+        invalidate(Model)
+        self.assertEqual(get_choice_index(Model, 'FIELD_CHOICES').flat, (('foo', 'Foo 2'),))
+        self.assertEqual(get_choice_index(Model, 'FIELD_CHOICES').flat, (('foo', 'Foo 2'),))
+
+        # Another process, without a local index, would load the choices
+        # again too.
+        Model._choice_indexes.clear()
+        self.assertEqual(get_choice_index(Model, 'FIELD_CHOICES').flat, (('foo', 'Foo 2'),))
+        invalidate(Model, 'field')
+        Model._choice_indexes.clear()
+        self.assertEqual(get_choice_index(Model, 'FIELD_CHOICES').flat, (('foo', 'Foo 3'),))
+
+    def test_invalidate_provider_in_other_process(self):
+        cache.clear()
+
+        class Model(object):
+            FIELD_CHOICES = ChoiceProvider(self.load, cache_alias='default', version_check_interval=60)
+
+        index = get_choice_index(Model, 'FIELD_CHOICES')
+        self.assertEqual(index.flat, (('foo', 'Foo 1'),))
+
+        # Another process invalidates the choices, which doesn't touch the
+        # local index. Its version is only checked once the interval is over.
+        Model.FIELD_CHOICES.invalidate(Model, 'FIELD_CHOICES')
+        self.assertIs(get_choice_index(Model, 'FIELD_CHOICES'), index)
+        index.version_check = time.time()
+        self.assertEqual(get_choice_index(Model, 'FIELD_CHOICES').flat, (('foo', 'Foo 2'),))
+        self.assertEqual(self.loaded, [Model, Model])
+
+    def test_version_check_unchanged(self):
+        cache.clear()
+
+        class Model(object):
+            FIELD_CHOICES = ChoiceProvider(self.load, cache_alias='default', version_check_interval=0)
+
+        index = get_choice_index(Model, 'FIELD_CHOICES')
+        self.assertIs(get_choice_index(Model, 'FIELD_CHOICES'), index)
+        self.assertEqual(self.loaded, [Model])
+
+    def test_no_version_check(self):
+        cache.clear()
+
+        class Model(object):
+            FIELD_CHOICES = ChoiceProvider(self.load, cache_alias='default', version_check_interval=None)
+
+        index = get_choice_index(Model, 'FIELD_CHOICES')
+        self.assertIsNone(index.version_check)
+        Model.FIELD_CHOICES.invalidate(Model, 'FIELD_CHOICES')
+        self.assertIs(get_choice_index(Model, 'FIELD_CHOICES'), index)
+
+    def test_signal(self):
+        received = []
+
+        def receiver(sender, field, **kwargs):
+            received.append((sender, field))
+
+        choices_invalidated.connect(receiver)
+        try:
+            invalidate(Book, 'genre')
+        finally:
+            choices_invalidated.disconnect(receiver)
+        self.assertEqual(received, [(Book, 'genre')])
+
+    def test_invalidate_on_change(self):
+        receiver = invalidate_on_change(Chapter, Book, 'genre')
+        try:
+            index = get_choice_index(Book, 'GENRE_CHOICES')
+            book = Book.objects.create(title='Dracula', category='fiction', genre='horror')
+            self.assertIs(get_choice_index(Book, 'GENRE_CHOICES'), index)
+
+            chapter = Chapter.objects.create(book=book, name='Jonathan Harker')
+            self.assertIsNot(get_choice_index(Book, 'GENRE_CHOICES'), index)
+
+            index = get_choice_index(Book, 'GENRE_CHOICES')
+            chapter.delete()
+            self.assertIsNot(get_choice_index(Book, 'GENRE_CHOICES'), index)
+        finally:
+            post_save.disconnect(receiver, sender=Chapter)
+            post_delete.disconnect(receiver, sender=Chapter)
@@ -0,0 +1,93 @@
+from django.test import TestCase
+
+from lazychoices import invalidate, stats
+from lazychoices.choices import get_choice_index
+from lazychoices.signals import stats_recorded
+from lazychoices.test import CaptureChoiceEvents, LazyChoicesTestMixin
+from tests.admin.models import Book
+
+
+class StatsTests(TestCase):
+    def setUp(self):
+        stats.reset()
+        invalidate(Book)
+
+    def tearDown(self):
+        stats.disable()
+        stats.reset()
+
+    def test_disabled(self):
+        Book(genre='crime').get_genre_display()
+        self.assertFalse(stats.is_enabled())
+        self.assertEqual(stats.get_stats(), {})
+
+    def test_lookups(self):
+        stats.enable()
+        get_choice_index(Book, 'GENRE_CHOICES')
+        get_choice_index(Book, 'GENRE_CHOICES')
+        self.addCleanup(setattr, Book, 'GENRE_CHOICES', Book.GENRE_CHOICES)
+        Book.GENRE_CHOICES = list(Book.GENRE_CHOICES)
+        get_choice_index(Book, 'GENRE_CHOICES')
+
+        recorded = stats.get_stats()
+        self.assertEqual(recorded['lookup']['count'], 3)
+        self.assertGreater(recorded['lookup']['time'], 0)
+        self.assertEqual(recorded['lookup.miss']['count'], 1)
+        self.assertEqual(recorded['lookup.hit']['count'], 1)
+        self.assertEqual(recorded['lookup.rebuild']['count'], 1)
+
+        stats.reset()
+        self.assertEqual(stats.get_stats(), {})
+
+    def test_validate_and_display(self):
+        stats.enable()
+        book = Book(title='Dracula', category='fiction', genre='horror')
+        book.full_clean()
+        self.assertEqual(book.get_genre_display(), 'Horror')
+
+        recorded = stats.get_stats()
+        self.assertEqual(recorded['validate']['count'], 2)
+        self.assertEqual(recorded['display']['count'], 1)
+
+    def test_signal(self):
+        received = []
+
+        def receiver(sender, event, choices_name, elapsed, **kwargs):
+            received.append((sender, event, choices_name, elapsed is not None))
+
+        stats.enable()
+        stats_recorded.connect(receiver)
+        try:
+            Book(genre='crime').get_genre_display()
+        finally:
+            stats_recorded.disconnect(receiver)
+        self.assertEqual(received, [
+            (Book, 'lookup.miss', 'GENRE_CHOICES', False),
+            (Book, 'lookup', 'GENRE_CHOICES', True),
+            (Book, 'display', 'GENRE_CHOICES', True),
+        ])
+
+
+class LazyChoicesTestMixinTests(LazyChoicesTestMixin, TestCase):
+    def test_capture(self):
+        with CaptureChoiceEvents() as captured:
+            get_choice_index(Book, 'GENRE_CHOICES')
+        self.assertEqual(captured.count('lookup'), 1)
+        self.assertFalse(stats.is_enabled())
+
+    def test_assert_max_choice_resolutions(self):
+        book = Book(genre='crime')
+        with self.assertMaxChoiceResolutions(2):
+            book.get_genre_display()
+            book.get_category_display()
+        self.assertMaxChoiceResolutions(1, book.get_genre_display)
+
+        with self.assertRaisesMessage(AssertionError, '2 choice resolutions'):
+            with self.assertMaxChoiceResolutions(1):
+                book.get_genre_display()
+                book.get_category_display()
+
+    def test_assert_max_choice_resolutions_event(self):
+        get_choice_index(Book, 'GENRE_CHOICES')
+        with self.assertMaxChoiceResolutions(0, event='lookup.rebuild'):
+            Book(genre='crime').get_genre_display()